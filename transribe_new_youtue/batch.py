@@ -0,0 +1,180 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+from download_engine import download_videos, DEFAULT_WORKERS
+from enumeration import as_record
+from manifest import RunManifest
+import log
+
+logger = log.get_logger(__name__)
+
+# Non-interactive bulk mode. Reads a list of mixed video, playlist and
+# channel URLs (one per line, '#' starts a comment), normalizes and
+# deduplicates them, and runs every job against one shared download pool.
+# A JSON report of what happened to each URL is written at the end.
+#
+#   python cli.py batch urls.txt --report report.json
+#   cat urls.txt | python cli.py batch -
+
+DEFAULT_JOBS = 2
+VIDEOS_DIR = "Videos"
+
+def on_domain(host, domain):
+    """Whether host is domain itself or one of its subdomains"""
+    return host == domain or host.endswith('.' + domain)
+
+def normalize_url(url):
+    """Return (kind, canonical_url) for a YouTube URL, or None if it is not one.
+
+    kind is 'video', 'playlist', 'channel' or 'channel-playlists'. A watch URL
+    carrying a list= parameter counts as its playlist.
+    """
+    url = url.strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = 'https://' + url
+    parsed = urlparse(url)
+    host = parsed.hostname or ''
+    query = parse_qs(parsed.query)
+    path = parsed.path.rstrip('/')
+
+    if on_domain(host, 'youtu.be'):
+        video_id = path.lstrip('/')
+        return ('video', f"https://www.youtube.com/watch?v={video_id}") if video_id else None
+    if not on_domain(host, 'youtube.com'):
+        return None
+    if 'list' in query:
+        return 'playlist', f"https://www.youtube.com/playlist?list={query['list'][0]}"
+    if path == '/watch' and 'v' in query:
+        return 'video', f"https://www.youtube.com/watch?v={query['v'][0]}"
+    if path.startswith(('/shorts/', '/live/')):
+        return 'video', f"https://www.youtube.com/watch?v={path.split('/')[2]}"
+
+    parts = path.split('/')
+    if len(parts) > 1 and parts[1].startswith('@'):
+        channel = '/' + parts[1]
+        tail = parts[2:]
+    elif len(parts) > 2 and parts[1] in ('channel', 'c', 'user'):
+        channel = '/' + '/'.join(parts[1:3])
+        tail = parts[3:]
+    else:
+        return None
+    if tail and tail[0] == 'playlists':
+        return 'channel-playlists', f"https://www.youtube.com{channel}/playlists"
+    return 'channel', f"https://www.youtube.com{channel}"
+
+def read_jobs(lines):
+    """Turn URL lines into a deduplicated, ordered list of jobs"""
+    jobs = {}
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        job = normalize_url(line)
+        if job is None:
+            logger.warning("Skipping unrecognized URL: %s", line)
+            continue
+        if job not in jobs:
+            jobs[job] = {'kind': job[0], 'url': job[1], 'source': line}
+    return list(jobs.values())
+
+def video_results(results):
+    """Per-video report entries from download_videos results"""
+    entries = []
+    for video, ok in results:
+        video = as_record(video)
+        entries.append({'id': video['id'], 'title': video['title'], 'ok': ok})
+    return entries
+
+def run_videos(urls, max_workers, manifest, executor):
+    import playlist_transcriber
+    _, _, results = download_videos([as_record(url) for url in urls], VIDEOS_DIR, playlist_transcriber.download_video_transcript, max_workers, manifest, executor, playlist_transcriber.OUTPUT_FORMATS)
+    return {'videos': video_results(results)}
+
+def run_job(job, max_workers, manifest, executor):
+    """Run one playlist or channel job and return its report fields.
+
+    The downloaders log their own errors and return empty results; a job
+    that yields no videos (or no playlists) raises so it is reported as failed.
+    """
+    if job['kind'] == 'playlist':
+        import playlist_transcriber
+        _, _, results = playlist_transcriber.transcribe_playlist(job['url'], max_workers, manifest, executor)
+        if not results:
+            raise RuntimeError("no videos found in the playlist")
+        return {'videos': video_results(results)}
+    if job['kind'] == 'channel':
+        import channel_transcriber
+        _, _, results = channel_transcriber.transcribe_channel(job['url'], max_workers, manifest, executor)
+        if not results:
+            raise RuntimeError("no videos found on the channel")
+        return {'videos': video_results(results)}
+    import channel_playlist_transcriber
+    successful, failed = channel_playlist_transcriber.process_channel_playlists(job['url'], max_workers, manifest, executor)
+    if successful + failed == 0:
+        raise RuntimeError("no playlists found on the channel")
+    return {'playlists_successful': successful, 'playlists_failed': failed}
+
+def run_batch(jobs, max_workers=DEFAULT_WORKERS, manifest=None, concurrent_jobs=DEFAULT_JOBS):
+    """Run all jobs over one shared download pool and return the report.
+
+    Single videos are gathered into one job; playlist and channel jobs are
+    enumerated concurrent_jobs at a time while max_workers transcript
+    downloads run across all of them.
+    """
+    if manifest is None:
+        manifest = RunManifest()
+    started = time.time()
+    report_jobs = []
+
+    def run(entry, func, *args):
+        job_started = time.time()
+        try:
+            entry.update(func(*args))
+            entry['error'] = None
+        except Exception as e:
+            logger.error("Error processing %s: %s", entry['url'] or 'videos', e)
+            entry['error'] = str(e)
+        entry['seconds'] = round(time.time() - job_started, 3)
+
+    videos = [job for job in jobs if job['kind'] == 'video']
+    others = [job for job in jobs if job['kind'] != 'video']
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, ThreadPoolExecutor(max_workers=concurrent_jobs) as job_pool:
+        if videos:
+            os.makedirs(VIDEOS_DIR, exist_ok=True)
+            entry = {'kind': 'video', 'url': None, 'source': [job['source'] for job in videos]}
+            report_jobs.append(entry)
+            job_pool.submit(run, entry, run_videos, [job['url'] for job in videos], max_workers, manifest, executor)
+        for job in others:
+            entry = dict(job)
+            report_jobs.append(entry)
+            job_pool.submit(run, entry, run_job, job, max_workers, manifest, executor)
+
+    all_videos = [video for entry in report_jobs for video in entry.get('videos', [])]
+    return {
+        'started_at': started,
+        'finished_at': time.time(),
+        'jobs': report_jobs,
+        'totals': {
+            'jobs': len(report_jobs),
+            'failed_jobs': sum(1 for entry in report_jobs if entry['error']),
+            'videos': len(all_videos),
+            'successful': sum(1 for video in all_videos if video['ok']),
+            'failed': sum(1 for video in all_videos if not video['ok']),
+        },
+    }
+
+def write_report(report, path):
+    """Write the report as JSON to a file, or to stdout when path is '-'"""
+    if path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logger.info("Report saved to: %s", path)
@@ -0,0 +1,146 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import fixtures
+import http_client
+import log
+import playlist_transcriber
+import channel_playlist_transcriber
+import get_matthew_playlists
+import output_writers
+
+# Times the page parsing and transcript formatting hot paths over the
+# fixtures in fixtures.py and reports best-of-N wall time and peak
+# traced memory per function and size.
+#
+#   python benchmarks/bench_parsing.py                  # run and compare with baselines
+#   python benchmarks/bench_parsing.py --save-baseline  # record new baselines
+
+BASELINE_PATH = os.path.join(HERE, "baselines.json")
+
+def fake_response(content):
+    """A 200 response carrying fixture bytes, as http_client.get would return"""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.encoding = 'utf-8'
+    response.url = "https://www.youtube.com/@bench/playlists"
+    return response
+
+@contextlib.contextmanager
+def serving(content):
+    """Answer http_client.get with the given page for the duration of a benchmark"""
+    original = http_client.get
+    http_client.get = lambda url, **kwargs: fake_response(content)
+    try:
+        yield
+    finally:
+        http_client.get = original
+
+def bench_served(func):
+    """Wrap a function that fetches its own page so it reads the fixture instead"""
+    def run(content):
+        with serving(content):
+            return func("https://www.youtube.com/@bench")
+    return run
+
+def bench_written(formats):
+    """Save a transcript in the given formats into the working directory, as the downloaders do"""
+    def run(entries):
+        return output_writers.write_transcript(entries, "bench", formats)
+    return run
+
+# name -> (fixture kind, function taking the fixture)
+BENCHMARKS = {
+    'playlist_transcriber.analyze_html_response[playlist]': ('playlist', playlist_transcriber.analyze_html_response),
+    'playlist_transcriber.analyze_html_response[watch]': ('watch', playlist_transcriber.analyze_html_response),
+    'channel_playlist_transcriber.get_playlists': ('channel', bench_served(channel_playlist_transcriber.get_playlists)),
+    'get_matthew_playlists.get_playlists': ('channel', bench_served(get_matthew_playlists.get_playlists)),
+    'output_writers.write_transcript[text]': ('transcript', bench_written(('text',))),
+    'output_writers.write_transcript[timestamped]': ('transcript', bench_written(('timestamped',))),
+    'output_writers.write_transcript[all]': ('transcript', bench_written(tuple(output_writers.WRITERS))),
+}
+
+def load_fixture(kind, size):
+    if kind == 'transcript':
+        return fixtures.transcript_entries(size)
+    return fixtures.get_page(kind, size)
+
+def measure(func, arg, repeat):
+    """Return (best seconds over repeat runs, peak traced bytes of one run)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+def load_baselines():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parsing and formatting hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(fixtures.SIZES), help="entries per fixture")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark (best is reported)")
+    parser.add_argument('--only', help="run only benchmarks whose name contains this text")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baselines")
+    args = parser.parse_args()
+    # The code under test logs progress to stderr; keep only problems so the table stays readable
+    log.configure('warning')
+
+    baselines = load_baselines()
+    results = {}
+    print(f"{'benchmark':<56} {'size':>6} {'time ms':>10} {'peak KB':>10} {'vs base':>8}")
+
+    # The functions under test print progress and write debug files; keep
+    # both out of the way.
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name, (kind, func) in BENCHMARKS.items():
+                if args.only and args.only not in name:
+                    continue
+                for size in args.sizes:
+                    arg = load_fixture(kind, size)
+                    try:
+                        with contextlib.redirect_stdout(devnull):
+                            seconds, peak = measure(func, arg, args.repeat)
+                    except Exception as e:
+                        print(f"{name:<56} {size:>6} failed: {e}")
+                        continue
+                    key = f"{name}@{size}"
+                    results[key] = {'seconds': seconds, 'peak_bytes': peak}
+                    ratio = ''
+                    if key in baselines:
+                        ratio = f"{seconds / baselines[key]['seconds']:.2f}x"
+                    print(f"{name:<56} {size:>6} {seconds * 1000:>10.2f} {peak / 1024:>10.0f} {ratio:>8}")
+        finally:
+            os.chdir(cwd)
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved {len(results)} baselines to {BASELINE_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# Measures process start-up: interpreter launch plus imports, which is
+# most of the cost of the short jobs schedulers run. Each case is a fresh
+# interpreter; best-of-N wall time is reported.
+#
+#   python benchmarks/bench_startup.py                  # run and compare with baselines
+#   python benchmarks/bench_startup.py --save-baseline  # record new baselines
+
+BASELINE_PATH = os.path.join(HERE, "baselines.json")
+
+# name -> arguments after the python executable
+CASES = {
+    'python -c pass': ['-c', 'pass'],
+    'cli.py --help': ['cli.py', '--help'],
+    'import youtube_transcriber': ['-c', 'import youtube_transcriber'],
+    'import playlist_transcriber': ['-c', 'import playlist_transcriber'],
+    'import channel_transcriber': ['-c', 'import channel_transcriber'],
+    'import channel_playlist_transcriber': ['-c', 'import channel_playlist_transcriber'],
+    'import combined': ['-c', 'import combined'],
+}
+
+def measure(args, repeat):
+    """Return the best wall time of repeat fresh interpreter runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def load_baselines():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interpreter start-up and import time")
+    parser.add_argument('--repeat', type=int, default=10, help="runs per case (best is reported)")
+    parser.add_argument('--only', help="run only cases whose name contains this text")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baselines")
+    args = parser.parse_args()
+
+    baselines = load_baselines()
+    results = {}
+    print(f"{'startup':<40} {'time ms':>10} {'vs base':>8}")
+    for name, case_args in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        try:
+            seconds = measure(case_args, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<40} failed: exit status {e.returncode}")
+            continue
+        key = f"startup:{name}"
+        results[key] = {'seconds': seconds}
+        ratio = ''
+        if key in baselines:
+            ratio = f"{seconds / baselines[key]['seconds']:.2f}x"
+        print(f"{name:<40} {seconds * 1000:>10.2f} {ratio:>8}")
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved {len(results)} baselines to {BASELINE_PATH}")
+
+if __name__ == "__main__":
+    main()
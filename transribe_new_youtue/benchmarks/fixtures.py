@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+
+# Page fixtures for the benchmarks. Each fixture is the recorded channel
+# page in debug_page.html with its ytInitialData swapped for a generated
+# one of the requested size, so the surrounding HTML, scripts and page
+# weight are those of a real YouTube response.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from yt_initial_data import MARKERS, _decoder
+
+FIXTURE_DIR = os.path.join(HERE, "fixtures")
+SHELL_PAGE = os.path.join(os.path.dirname(HERE), "debug_page.html")
+SIZES = (100, 1000, 5000)
+
+def _text(value):
+    return {'runs': [{'text': value}]}
+
+def video_renderer(i):
+    """A playlistVideoRenderer shaped like the ones on a playlist page"""
+    video_id = f"vid{i:08d}"
+    return {'playlistVideoRenderer': {
+        'videoId': video_id,
+        'thumbnail': {'thumbnails': [{'url': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", 'width': 336, 'height': 188}]},
+        'title': {'runs': [{'text': f"Lecture {i} - Discourse on the path of devotion, part {i % 17}"}], 'accessibility': {'accessibilityData': {'label': f"Lecture {i} 1 hour, 2 minutes"}}},
+        'index': {'simpleText': str(i + 1)},
+        'shortBylineText': _text("Shrimad Rajchandra Mission Dharampur"),
+        'lengthText': {'simpleText': "1:02:03"},
+        'navigationEndpoint': {'commandMetadata': {'webCommandMetadata': {'url': f"/watch?v={video_id}&list=PLbench&index={i + 1}", 'webPageType': 'WEB_PAGE_TYPE_WATCH'}}, 'watchEndpoint': {'videoId': video_id, 'playlistId': 'PLbench', 'index': i}},
+        'lengthSeconds': '3723',
+        'isPlayable': True,
+        'videoInfo': {'runs': [{'text': '12K'}, {'text': ' views • '}, {'text': '2 years ago'}]},
+    }}
+
+def panel_renderer(i):
+    """A playlistPanelVideoRenderer shaped like the ones on a watch page"""
+    video_id = f"vid{i:08d}"
+    return {'playlistPanelVideoRenderer': {
+        'title': {'simpleText': f"Lecture {i} - Discourse on the path of devotion, part {i % 17}"},
+        'longBylineText': _text("Shrimad Rajchandra Mission Dharampur"),
+        'thumbnail': {'thumbnails': [{'url': f"https://i.ytimg.com/vi/{video_id}/default.jpg", 'width': 120, 'height': 90}]},
+        'lengthText': {'simpleText': "1:02:03"},
+        'indexText': {'simpleText': str(i + 1)},
+        'navigationEndpoint': {'watchEndpoint': {'videoId': video_id, 'playlistId': 'PLbench', 'index': i}},
+        'videoId': video_id,
+    }}
+
+def playlist_renderer(i):
+    """A gridPlaylistRenderer shaped like the ones on a channel playlists tab"""
+    playlist_id = f"PLbench{i:010d}"
+    return {'gridPlaylistRenderer': {
+        'playlistId': playlist_id,
+        'thumbnail': {'thumbnails': [{'url': f"https://i.ytimg.com/vi/x{i}/hqdefault.jpg", 'width': 480, 'height': 270}]},
+        'title': {'runs': [{'text': f"Series {i}: Commentary on the scriptures", 'navigationEndpoint': {'commandMetadata': {'webCommandMetadata': {'url': f"/playlist?list={playlist_id}"}}}}]},
+        'videoCountText': {'runs': [{'text': str(i % 90 + 1)}, {'text': ' videos'}]},
+        'videoCount': {'simpleText': f"{i % 90 + 1} videos"},
+        'publishedTimeText': {'simpleText': 'Updated 3 days ago'},
+    }}
+
+def playlist_page_data(size):
+    items = [video_renderer(i) for i in range(size)]
+    return {
+        'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [{'tabRenderer': {'selected': True, 'content': {'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [{'playlistVideoListRenderer': {'contents': items, 'playlistId': 'PLbench'}}]}}]}}}}]}},
+        'header': {'playlistHeaderRenderer': {'playlistId': 'PLbench', 'title': {'simpleText': 'Benchmark playlist'}, 'ownerText': _text('Shrimad Rajchandra Mission Dharampur')}},
+    }
+
+def watch_page_data(size):
+    items = [panel_renderer(i) for i in range(size)]
+    return {'contents': {'twoColumnWatchNextResults': {'playlist': {'playlist': {'title': 'Benchmark playlist', 'contents': items, 'playlistId': 'PLbench'}}}}}
+
+def channel_page_data(size):
+    items = [playlist_renderer(i) for i in range(size)]
+    return {
+        'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [
+            {'tabRenderer': {'title': 'Home'}},
+            {'tabRenderer': {'title': 'Playlists', 'selected': True, 'content': {'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [{'gridRenderer': {'items': items}}]}}]}}}},
+        ]}},
+        'metadata': {'channelMetadataRenderer': {'title': 'Shrimad Rajchandra Mission Dharampur', 'externalId': 'UCxq3qIO8Veh0XYEZzCpHVFg'}},
+    }
+
+def transcript_entries(size):
+    """A fetched transcript of the given number of segments"""
+    return [{'text': f"segment {i} of the discourse on devotion and knowledge", 'start': i * 3.25, 'duration': 3.25} for i in range(size)]
+
+PAGE_BUILDERS = {
+    'playlist': playlist_page_data,
+    'watch': watch_page_data,
+    'channel': channel_page_data,
+}
+
+def _split_shell():
+    """Return the recorded page split around its ytInitialData blob"""
+    with open(SHELL_PAGE, 'r', encoding='utf-8') as f:
+        page = f.read()
+    marker = MARKERS[0].decode()
+    start = page.index(marker) + len(marker)
+    _, end = _decoder.raw_decode(page, start)
+    return page[:start], page[end:]
+
+def get_page(kind, size):
+    """Return the fixture page bytes, generating and saving it on first use"""
+    path = os.path.join(FIXTURE_DIR, f"{kind}_{size}.html")
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        head, tail = _split_shell()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(head + json.dumps(PAGE_BUILDERS[kind](size)) + tail)
+    with open(path, 'rb') as f:
+        return f.read()
@@ -0,0 +1,54 @@
+import xml.etree.ElementTree as ET
+import http_client
+import log
+
+logger = log.get_logger(__name__)
+
+# Reads a channel's Atom feed: a few KB listing its most recent uploads,
+# newest first. Used for incremental syncs, where only videos published
+# since the last run matter. FEED_URL can point at any server that
+# serves the same format, such as a local stand-in during testing.
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+
+# Number of uploads YouTube lists in a channel feed
+FEED_WINDOW = 15
+
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+}
+
+def feed_url(channel_id, template=None):
+    """Return the feed URL of a channel"""
+    return (template or FEED_URL).format(channel_id=channel_id)
+
+def parse_feed(content):
+    """Return the video records listed in a feed, newest first"""
+    root = ET.fromstring(content)
+    videos = []
+    for entry in root.findall('atom:entry', NAMESPACES):
+        video_id = entry.findtext('yt:videoId', namespaces=NAMESPACES)
+        if not video_id:
+            continue
+        videos.append({
+            'id': video_id,
+            'url': f"https://www.youtube.com/watch?v={video_id}",
+            'title': entry.findtext('atom:title', namespaces=NAMESPACES) or None,
+            'index': None,
+            'duration': None,
+        })
+    return videos
+
+def fetch_feed(channel_id, template=None):
+    """Return the records of a channel's feed, or None if it could not be read"""
+    url = feed_url(channel_id, template)
+    try:
+        response = http_client.get(url)
+        if response.status_code != 200:
+            logger.warning("Error reading channel feed: %s", response.status_code, extra={'status': response.status_code})
+            return None
+        return parse_feed(response.content)
+    except Exception as e:
+        logger.warning("Error reading channel feed: %s", e)
+        return None
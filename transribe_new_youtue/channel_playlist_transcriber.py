@@ -1,12 +1,20 @@
-from youtube_transcript_api import YouTubeTranscriptApi
 import re
 from urllib.parse import urlparse, parse_qs
-import requests
+import http_client
 import os
-import time
-from bs4 import BeautifulSoup
-import json
-from playlist_transcriber import get_playlist_videos, download_video_transcript, get_safe_filename
+from playlist_transcriber import download_video_transcript, get_safe_filename, get_video_title
+import playlist_transcriber
+import output_writers
+from playlist_discovery import iter_page_playlists, playlists_url
+from enumeration import iter_playlist_page_videos, as_record, with_titles
+from download_engine import download_videos, DEFAULT_WORKERS
+from manifest import RunManifest
+from yt_initial_data import extract_initial_data, get_playlist_video_renderers, get_playlist_header
+import log
+import debug_capture
+import profiling
+
+logger = log.get_logger(__name__)
 
 def get_channel_name(channel_url):
     """Get channel name from URL or page"""
@@ -17,14 +25,12 @@ def get_channel_name(channel_url):
             return channel_name
         
         # If not in URL, fetch from page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
-        response = requests.get(channel_url, headers=headers)
+        response = http_client.get(channel_url)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            from bs4 import BeautifulSoup
+            with profiling.span('bs4_parse'):
+                soup = BeautifulSoup(response.text, 'html.parser')
             
             # Try to get channel name from meta tags
             meta_title = soup.find('meta', {'property': 'og:title'})
@@ -38,7 +44,7 @@ def get_channel_name(channel_url):
                 return channel_name
     
     except Exception as e:
-        print(f"Error getting channel name: {str(e)}")
+        logger.error("Error getting channel name: %s", e)
     
     return "Unknown_Channel"
 
@@ -47,115 +53,29 @@ def get_playlists(channel_url):
     playlists = []
     try:
         # Ensure URL ends with /playlists
-        if not channel_url.endswith('/playlists'):
-            channel_url = channel_url.rstrip('/') + '/playlists'
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
+        channel_url = playlists_url(channel_url)
         
-        print(f"\nFetching playlists from: {channel_url}")
-        response = requests.get(channel_url, headers=headers)
+        logger.info("Fetching playlists from: %s", channel_url)
+        response = http_client.get(channel_url)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Save HTML for debugging
-            with open("mathew.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            print("\nSaved HTML to mathew.html for debugging")
-            
             # Look for ytInitialData
-            print("\nLooking for playlist data...")
-            for script in soup.find_all('script'):
-                if script.string and 'var ytInitialData = ' in script.string:
-                    print("Found ytInitialData")
-                    # Extract the JSON data
-                    data_text = script.string
-                    start_idx = data_text.find('var ytInitialData = ') + len('var ytInitialData = ')
-                    end_idx = data_text.find(';</script>', start_idx)
-                    
-                    if start_idx > 0 and end_idx > 0:
-                        try:
-                            data = json.loads(data_text[start_idx:end_idx])
-                            
-                            # Save raw data for debugging
-                            with open("yt_data.json", "w", encoding="utf-8") as f:
-                                json.dump(data, f, indent=2)
-                            print("Saved raw data to yt_data.json")
-                            
-                            # Extract playlists recursively from the data
-                            def extract_playlists_from_data(obj):
-                                if isinstance(obj, dict):
-                                    # Check for playlist renderer
-                                    if 'playlistRenderer' in obj:
-                                        playlist_data = obj['playlistRenderer']
-                                        playlist_id = playlist_data.get('playlistId', '')
-                                        title = ''
-                                        
-                                        # Extract title
-                                        title_obj = playlist_data.get('title', {})
-                                        if isinstance(title_obj, dict):
-                                            if 'runs' in title_obj:
-                                                title = ' '.join(t.get('text', '') for t in title_obj['runs'])
-                                            elif 'simpleText' in title_obj:
-                                                title = title_obj['simpleText']
-                                        
-                                        if playlist_id and title:
-                                            playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
-                                            if playlist_url not in [p['url'] for p in playlists]:
-                                                playlists.append({
-                                                    'url': playlist_url,
-                                                    'id': playlist_id,
-                                                    'title': title
-                                                })
-                                                print(f"Found playlist: {title} ({playlist_url})")
-                                    
-                                    # Check for grid playlist renderer
-                                    elif 'gridPlaylistRenderer' in obj:
-                                        playlist_data = obj['gridPlaylistRenderer']
-                                        playlist_id = playlist_data.get('playlistId', '')
-                                        title = ''
-                                        
-                                        # Extract title
-                                        title_obj = playlist_data.get('title', {})
-                                        if isinstance(title_obj, dict):
-                                            if 'runs' in title_obj:
-                                                title = ' '.join(t.get('text', '') for t in title_obj['runs'])
-                                            elif 'simpleText' in title_obj:
-                                                title = title_obj['simpleText']
-                                        
-                                        if playlist_id and title:
-                                            playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
-                                            if playlist_url not in [p['url'] for p in playlists]:
-                                                playlists.append({
-                                                    'url': playlist_url,
-                                                    'id': playlist_id,
-                                                    'title': title
-                                                })
-                                                print(f"Found playlist: {title} ({playlist_url})")
-                                    
-                                    # Recursively search all values
-                                    for value in obj.values():
-                                        if isinstance(value, (dict, list)):
-                                            extract_playlists_from_data(value)
-                                
-                                elif isinstance(obj, list):
-                                    for item in obj:
-                                        if isinstance(item, (dict, list)):
-                                            extract_playlists_from_data(item)
-                            
-                            # Start recursive extraction
-                            extract_playlists_from_data(data)
-                            
-                        except json.JSONDecodeError as e:
-                            print(f"Error parsing JSON: {str(e)}")
-                            continue
+            logger.debug("Looking for playlist data...")
+            data = extract_initial_data(response.content)
+            if data:
+                logger.debug("Found ytInitialData")
+                
+                # Every playlist on the tab, following continuation pages
+                for playlist in iter_page_playlists(response.content, data):
+                    playlists.append(playlist)
+                    logger.debug("Found playlist: %s (%s)", playlist['title'], playlist['url'])
             
             # If no playlists found through ytInitialData, try HTML parsing
             if not playlists:
-                print("\nTrying HTML parsing method...")
+                logger.info("Trying HTML parsing method...")
+                from bs4 import BeautifulSoup
+                with profiling.span('bs4_parse'):
+                    soup = BeautifulSoup(response.content, 'html.parser')
                 # Look for playlist links
                 for link in soup.find_all('a', href=True):
                     href = link['href']
@@ -172,25 +92,64 @@ def get_playlists(channel_url):
                                 'id': playlist_id,
                                 'title': title
                             })
-                            print(f"Found playlist: {title} ({playlist_url})")
+                            logger.debug("Found playlist: %s (%s)", title, playlist_url)
             
-            print(f"\nFound {len(playlists)} playlists in total")
+            logger.info("Found %s playlists in total", len(playlists), extra={'count': len(playlists)})
+            if playlists:
+                debug_capture.sample('channel_playlists', response.content, channel_url)
+            else:
+                debug_capture.capture('channel_playlists', response.content, "no playlists", channel_url)
             
         else:
-            print(f"Error accessing channel: {response.status_code}")
+            logger.error("Error accessing channel: %s", response.status_code)
     
     except Exception as e:
-        print(f"Error getting playlists: {str(e)}")
+        logger.error("Error getting playlists: %s", e)
     
     return playlists
 
-def process_channel_playlists(channel_url):
-    """Process all playlists from a channel"""
+def iter_new_videos(videos, playlist_title, video_playlists, shared, manifest):
+    """Yield videos that still need a download in this playlist.
+
+    Every video is added to video_playlists (video id -> playlist titles).
+    Videos already downloaded for an earlier playlist of this run are
+    collected in shared instead of yielded; a video whose earlier attempt
+    did not complete is yielded again, so it is retried here.
+    """
+    for video in videos:
+        owners = video_playlists.setdefault(video['id'], [])
+        owners.append(playlist_title)
+        if len(owners) > 1 and manifest.completed_path(video['id']):
+            shared.append(video)
+        else:
+            yield video
+
+def link_shared_videos(shared, playlist_dir, manifest):
+    """Link transcripts of videos downloaded for an earlier playlist; returns how many were linked"""
+    linked = 0
+    for video in shared:
+        entry = manifest.get(video['id'])
+        if entry and entry['status'] == 'completed' and entry['output_path'] and os.path.exists(entry['output_path']):
+            output_writers.link_outputs(entry['output_path'], playlist_dir)
+            linked += 1
+    return linked
+
+def process_channel_playlists(channel_url, max_workers=DEFAULT_WORKERS, manifest=None, executor=None):
+    """Process all playlists from a channel, fetching each video's transcript once.
+
+    A video that appears in several playlists is downloaded into the first
+    one and linked into the others; if that download fails it is retried
+    in the next playlist. Videos the manifest lists as done are skipped.
+    Returns (successful_playlists, failed_playlists).
+    """
     try:
+        if manifest is None:
+            manifest = RunManifest()
+        
         # Get channel name
         channel_name = get_channel_name(channel_url)
         safe_channel_name = get_safe_filename(channel_name)
-        print(f"\nProcessing channel: {channel_name}")
+        logger.info("Processing channel: %s", channel_name)
         
         # Create channel directory
         if not os.path.exists(safe_channel_name):
@@ -200,16 +159,17 @@ def process_channel_playlists(channel_url):
         playlists = get_playlists(channel_url)
         
         if not playlists:
-            print("No playlists found in the channel.")
-            return
+            logger.warning("No playlists found in the channel.")
+            return 0, 0
         
         total_playlists = len(playlists)
         successful_playlists = 0
         failed_playlists = 0
+        video_playlists = {}  # video id -> titles of the playlists containing it
         
         # Process each playlist
         for i, playlist in enumerate(playlists, 1):
-            print(f"\nProcessing playlist {i}/{total_playlists}: {playlist['title']}")
+            logger.info("Processing playlist %s/%s: %s", i, total_playlists, playlist['title'])
             
             try:
                 # Create playlist directory
@@ -218,48 +178,46 @@ def process_channel_playlists(channel_url):
                 if not os.path.exists(playlist_dir):
                     os.makedirs(playlist_dir)
                 
-                # Get videos from playlist
-                videos = get_playlist_videos(playlist['id'])
+                # Process videos concurrently while the playlist is still being read;
+                # videos already downloaded for an earlier playlist are only linked
+                shared = []
+                videos = iter_new_videos(iter_playlist_videos(playlist['id']), playlist['title'], video_playlists, shared, manifest)
+                videos = with_titles(videos, get_video_title, manifest)
+                successful_videos, failed_videos, results = download_videos(videos, playlist_dir, download_video_transcript, max_workers, manifest, executor, playlist_transcriber.OUTPUT_FORMATS)
+                linked_videos = link_shared_videos(shared, playlist_dir, manifest)
                 
-                if not videos:
-                    print(f"No videos found in playlist: {playlist['title']}")
+                if not results and not shared:
+                    logger.warning("No videos found in playlist: %s", playlist['title'])
                     failed_playlists += 1
                     continue
                 
-                successful_videos = 0
-                failed_videos = 0
-                
-                # Process each video
-                for j, video_url in enumerate(videos, 1):
-                    print(f"\nProcessing video {j}/{len(videos)}")
-                    if download_video_transcript(video_url, playlist_dir):
-                        successful_videos += 1
-                    else:
-                        failed_videos += 1
-                    time.sleep(1)  # Add delay to avoid rate limiting
-                
-                print(f"\nPlaylist complete: {playlist['title']}")
-                print(f"Successfully downloaded: {successful_videos} transcripts")
-                print(f"Failed to download: {failed_videos} transcripts")
+                logger.info("Playlist complete: %s. Successfully downloaded: %s, failed: %s, linked from other playlists: %s",
+                            playlist['title'], successful_videos, failed_videos, linked_videos,
+                            extra={'playlist_id': playlist['id'], 'successful': successful_videos, 'failed': failed_videos, 'linked': linked_videos})
                 
-                if successful_videos > 0:
+                if successful_videos > 0 or linked_videos > 0:
                     successful_playlists += 1
                 else:
                     failed_playlists += 1
                 
             except Exception as e:
-                print(f"Error processing playlist {playlist['title']}: {str(e)}")
+                logger.error("Error processing playlist %s: %s", playlist['title'], e)
                 failed_playlists += 1
             
-            print(f"\nProgress: {i}/{total_playlists} playlists processed")
+            logger.info("Progress: %s/%s playlists processed", i, total_playlists)
         
-        print(f"\nChannel processing complete: {channel_name}")
-        print(f"Successfully processed: {successful_playlists} playlists")
-        print(f"Failed to process: {failed_playlists} playlists")
-        print(f"All transcripts are saved in the '{safe_channel_name}' directory")
+        logger.info("Channel processing complete: %s. Successfully processed: %s playlists, failed: %s",
+                    channel_name, successful_playlists, failed_playlists,
+                    extra={'successful_playlists': successful_playlists, 'failed_playlists': failed_playlists})
+        shared_total = sum(len(owners) - 1 for owners in video_playlists.values())
+        logger.info("Unique videos: %s (%s playlist entries shared with another playlist)", len(video_playlists), shared_total,
+                    extra={'unique_videos': len(video_playlists), 'shared_entries': shared_total})
+        logger.info("All transcripts are saved in the '%s' directory", safe_channel_name)
+        return successful_playlists, failed_playlists
         
     except Exception as e:
-        print(f"Error processing channel: {str(e)}")
+        logger.error("Error processing channel: %s", e)
+        return 0, 0
 
 def get_playlist_id(url):
     """Extract playlist ID from YouTube URL"""
@@ -268,122 +226,75 @@ def get_playlist_id(url):
         if 'list=' in url:
             return parse_qs(parsed_url.query)['list'][0]
     except Exception as e:
-        print(f"Error extracting playlist ID: {str(e)}")
+        logger.error("Error extracting playlist ID: %s", e)
     return None
 
-def get_playlist_videos(playlist_id):
-    """Get list of video URLs from playlist"""
-    videos = []
+def iter_playlist_videos(playlist_id):
+    """Yield video records from a playlist as each page is read"""
+    url = f"https://www.youtube.com/playlist?list={playlist_id}"
+    found = 0
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Cookie': 'CONSENT=YES+1'
-        }
-        
         # Try playlist page first
-        url = f"https://www.youtube.com/playlist?list={playlist_id}"
-        print(f"\nTrying to fetch playlist: {url}")
-        response = requests.get(url, headers=headers)
+        logger.debug("Trying to fetch playlist: %s", url)
+        response = http_client.get(url)
         
         if response.status_code == 200:
-            videos = analyze_html_response(response.text)
-        
-        # If no videos found, try the watch page
-        if not videos:
-            print("\nTrying watch page method...")
-            watch_url = f"https://www.youtube.com/watch?v=J43EoSZMLYE&list={playlist_id}"
-            response = requests.get(watch_url, headers=headers)
-            
-            if response.status_code == 200:
-                watch_videos = analyze_html_response(response.text)
-                for video in watch_videos:
-                    if video not in videos:
-                        videos.append(video)
-
-        # Show results
-        print(f"\nFound {len(videos)} videos in total")
-        if videos:
-            print("\nVideos found:")
-            for i, video in enumerate(videos, 1):
-                print(f"{i}. {url}")
-        else:
-            print("\nNo videos found. Please check if the playlist is:")
-            print("1. Public (not private or unlisted)")
-            print("2. Contains videos")
-            print("3. Accessible in your region")
-            print("\nYou can verify by opening the playlist URL in your browser:")
-            print(url)
-        
-        return videos
+            # Follow continuation pages so large playlists are complete
+            for video in iter_playlist_page_videos(response.content):
+                found += 1
+                logger.debug("%s. %s %s", found, video['url'], video['title'] or '')
+                yield video
+            if not found:
+                for video in analyze_html_response(response.content, url):
+                    found += 1
+                    yield as_record(video, found)
 
     except Exception as e:
-        print(f"Error getting playlist videos: {str(e)}")
-        return videos
+        logger.error("Error getting playlist videos: %s", e)
+
+    # Show results
+    logger.info("Found %s videos in total", found, extra={'count': found})
+    if not found:
+        logger.warning("No videos found. Check that the playlist is public, contains videos and is "
+                       "accessible in your region by opening it in your browser: %s", url)
+
+def get_playlist_videos(playlist_id):
+    """Get list of video records from playlist"""
+    return list(iter_playlist_videos(playlist_id))
 
-def analyze_html_response(html_content):
+def analyze_html_response(html_content, url=None):
     """Analyze HTML content for video links and playlist data"""
-    print("\nAnalyzing HTML response...")
-    soup = BeautifulSoup(html_content, 'html.parser')
-    video_links = []
+    logger.debug("Analyzing HTML response...")
+    video_links = {}  # insertion-ordered set of URLs
     
-    # Look for ytInitialData in script tags
-    print("\nLooking for ytInitialData...")
-    for script in soup.find_all('script'):
-        if script.string and 'var ytInitialData = ' in script.string:
-            try:
-                # Extract the JSON data
-                data_text = script.string.split('var ytInitialData = ')[1].split(';</script>')[0]
-                data = json.loads(data_text)
-                
-                # Try to find playlist videos in different possible locations
-                try:
-                    # For playlist page
-                    contents = data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])[0].get('tabRenderer', {}).get('content', {}).get('sectionListRenderer', {}).get('contents', [])[0].get('itemSectionRenderer', {}).get('contents', [])[0].get('playlistVideoListRenderer', {}).get('contents', [])
-                    if contents:
-                        for item in contents:
-                            if 'playlistVideoRenderer' in item:
-                                video_id = item['playlistVideoRenderer'].get('videoId')
-                                if video_id:
-                                    url = f"https://www.youtube.com/watch?v={video_id}"
-                                    if url not in video_links:
-                                        video_links.append(url)
-                                        print(f"Found video from playlist page: {url}")
-                except:
-                    pass
-                
-                try:
-                    # For watch page with playlist
-                    playlist_panel = data.get('contents', {}).get('twoColumnWatchNextResults', {}).get('playlist', {}).get('playlist', {}).get('contents', [])
-                    if playlist_panel:
-                        for item in playlist_panel:
-                            if 'playlistPanelVideoRenderer' in item:
-                                video_id = item['playlistPanelVideoRenderer'].get('videoId')
-                                if video_id:
-                                    url = f"https://www.youtube.com/watch?v={video_id}"
-                                    if url not in video_links:
-                                        video_links.append(url)
-                                        print(f"Found video from watch page playlist: {url}")
-                except:
-                    pass
-                
-            except Exception as e:
-                print(f"Error parsing ytInitialData: {str(e)}")
-                continue
+    # Read the playlist straight from ytInitialData
+    logger.debug("Looking for ytInitialData...")
+    data = extract_initial_data(html_content)
+    if data:
+        for renderer in get_playlist_video_renderers(data):
+            video_id = renderer.get('videoId')
+            if video_id:
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found video from ytInitialData: %s", video_url)
     
     # If no videos found through ytInitialData, try fallback methods
     if not video_links:
-        print("\nTrying fallback methods...")
+        logger.info("Trying fallback methods...")
+        from bs4 import BeautifulSoup
+        with profiling.span('bs4_parse'):
+            soup = BeautifulSoup(html_content, 'html.parser')
         
         # Look for video renderers
         renderers = soup.find_all(['ytd-playlist-video-renderer', 'ytd-playlist-panel-video-renderer'])
         for renderer in renderers:
             video_id = renderer.get('data-video-id')
             if video_id:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                if url not in video_links:
-                    video_links.append(url)
-                    print(f"Found video from renderer: {url}")
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found video from renderer: %s", video_url)
         
         # Look for thumbnail links
         thumbnails = soup.find_all('a', {'id': 'thumbnail'})
@@ -391,22 +302,22 @@ def analyze_html_response(html_content):
             href = thumbnail.get('href', '')
             if '/watch?v=' in href:
                 video_id = href.split('watch?v=')[1].split('&')[0]
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                if url not in video_links:
-                    video_links.append(url)
-                    print(f"Found video from thumbnail: {url}")
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found video from thumbnail: %s", video_url)
     
-    # Print summary
+    # Summary; each link was already logged at debug level when found
     if video_links:
-        print(f"\nFound {len(video_links)} unique video links:")
-        for i, url in enumerate(video_links, 1):
-            print(f"{i}. {url}")
+        logger.info("Found %s unique video links", len(video_links), extra={'count': len(video_links)})
+        debug_capture.sample('playlist_page', html_content, url)
     else:
-        print("\nNo video links found!")
+        logger.warning("No video links found!")
+        debug_capture.capture('playlist_page', html_content, "no video links", url)
     
-    return video_links
+    return list(video_links)
 
-def process_playlist():
+def process_playlist(max_workers=DEFAULT_WORKERS, manifest=None):
     """Process a YouTube playlist"""
     try:
         # Get playlist URL
@@ -425,7 +336,7 @@ def process_playlist():
         # Get playlist ID
         playlist_id = get_playlist_id(playlist_url)
         if not playlist_id:
-            print("Error: Could not extract playlist ID from URL")
+            logger.error("Error: Could not extract playlist ID from URL")
             return True
         
         # Get channel and playlist names
@@ -444,36 +355,27 @@ def process_playlist():
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        print(f"\nChannel: {channel_name}")
-        print(f"Playlist: {playlist_name}")
-        print(f"Getting videos from playlist: {playlist_url}")
-        videos = get_playlist_videos(playlist_id)
-        
-        if not videos:
-            print("No videos found in the playlist.")
-            return True
-        
-        print(f"\nFound {len(videos)} videos. Starting transcript download...")
+        logger.info("Channel: %s, playlist: %s", channel_name, playlist_name)
+        logger.info("Getting videos from playlist: %s", playlist_url, extra={'playlist_id': playlist_id})
+        if manifest is None:
+            manifest = RunManifest()
+        # Downloads start as soon as the first page of videos is read
+        videos = with_titles(iter_playlist_videos(playlist_id), get_video_title, manifest)
+        logger.info("Starting transcript download...")
         
-        successful = 0
-        failed = 0
+        successful, failed, results = download_videos(videos, output_dir, download_video_transcript, max_workers, manifest, formats=playlist_transcriber.OUTPUT_FORMATS)
         
-        for i, video_url in enumerate(videos, 1):
-            print(f"\nProcessing video {i}/{len(videos)}")
-            if download_video_transcript(video_url, output_dir):
-                successful += 1
-            else:
-                failed += 1
-            time.sleep(1)  # Add delay to avoid rate limiting
+        if not results:
+            logger.warning("No videos found in the playlist.")
+            return True
         
-        print(f"\nDownload complete!")
-        print(f"Successfully downloaded: {successful} transcripts")
-        print(f"Failed to download: {failed} transcripts")
-        print(f"Transcripts are saved in: {output_dir}")
+        logger.info("Download complete! Successfully downloaded: %s, failed: %s. Transcripts are saved in: %s",
+                    successful, failed, output_dir,
+                    extra={'successful': successful, 'failed': failed, 'output_dir': output_dir})
         return True
 
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {str(e)}")
+        logger.error("An unexpected error occurred: %s", e)
         print("Please try again with a different playlist URL.")
         return True
 
@@ -481,49 +383,20 @@ def get_channel_and_playlist_info(playlist_id):
     """Get channel name and playlist title"""
     try:
         url = f"https://www.youtube.com/playlist?list={playlist_id}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # Try to get channel name and playlist title from ytInitialData
-            for script in soup.find_all('script'):
-                if script.string and 'var ytInitialData = ' in script.string:
-                    data_text = script.string
-                    start_idx = data_text.find('var ytInitialData = ') + len('var ytInitialData = ')
-                    end_idx = data_text.find(';</script>', start_idx)
-                    
-                    if start_idx > 0 and end_idx > 0:
-                        try:
-                            data = json.loads(data_text[start_idx:end_idx])
-                            
-                            # Try to get playlist title
-                            playlist_title = None
-                            header = data.get('header', {}).get('playlistHeaderRenderer', {})
-                            if header:
-                                title_obj = header.get('title', {})
-                                if 'runs' in title_obj:
-                                    playlist_title = ' '.join(t.get('text', '') for t in title_obj['runs'])
-                                elif 'simpleText' in title_obj:
-                                    playlist_title = title_obj['simpleText']
-                            
-                            # Try to get channel name
-                            channel_name = None
-                            owner = header.get('ownerText', {})
-                            if 'runs' in owner:
-                                channel_name = owner['runs'][0].get('text', '')
-                            
-                            if channel_name and playlist_title:
-                                return channel_name, playlist_title
-                            
-                        except json.JSONDecodeError:
-                            pass
+            data = extract_initial_data(response.content)
+            if data:
+                channel_name, playlist_title = get_playlist_header(data)
+                if channel_name and playlist_title:
+                    return channel_name, playlist_title
             
             # Fallback to HTML parsing
+            from bs4 import BeautifulSoup
+            with profiling.span('bs4_parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             # Try to get playlist title
             title_tag = soup.find('meta', {'property': 'og:title'})
             playlist_title = title_tag['content'].replace(' - YouTube', '') if title_tag else f"Playlist_{playlist_id}"
@@ -535,7 +408,7 @@ def get_channel_and_playlist_info(playlist_id):
             return channel_name, playlist_title
             
     except Exception as e:
-        print(f"Error getting channel and playlist info: {str(e)}")
+        logger.error("Error getting channel and playlist info: %s", e)
     
     return "Unknown_Channel", f"Playlist_{playlist_id}"
 
@@ -1,11 +1,25 @@
-from youtube_transcript_api import YouTubeTranscriptApi
+from transcript_selection import fetch_transcript
 import re
 from urllib.parse import urlparse, parse_qs
-import requests
+import http_client
 import os
-import time
-from bs4 import BeautifulSoup
-import json
+from yt_initial_data import extract_initial_data, get_channel_external_id
+from enumeration import iter_channel_page_videos, iter_playlist_videos, as_record, with_titles
+from download_engine import download_videos, DEFAULT_WORKERS
+from manifest import RunManifest
+from channel_feed import fetch_feed, FEED_WINDOW
+import log
+import debug_capture
+import profiling
+import output_writers
+
+logger = log.get_logger(__name__)
+
+# Hindi tracks come right after English since most of these videos are in Hindi
+TRACK_POLICY = ('manual:en', 'generated:en', 'manual:hi', 'generated:hi', 'manual:*', 'any')
+
+# Files written per video, by output_writers name; the first one is recorded in the manifest
+OUTPUT_FORMATS = ('timestamped',)
 
 def get_channel_id(url):
     """Extract channel ID from various YouTube channel URL formats"""
@@ -14,9 +28,17 @@ def get_channel_id(url):
             return url.split('youtube.com/channel/')[1].split('/')[0]
         
         # For user URLs, we need to fetch the page to get channel ID
-        response = requests.get(url)
+        response = http_client.get(url)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # The page metadata carries the id directly
+            data = extract_initial_data(response.content)
+            channel_id = get_channel_external_id(data) if data else None
+            if channel_id:
+                return channel_id
+
+            from bs4 import BeautifulSoup
+            with profiling.span('bs4_parse'):
+                soup = BeautifulSoup(response.text, 'html.parser')
             # Try to find channel ID in meta tags
             for link in soup.find_all('meta'):
                 if 'content' in link.attrs:
@@ -26,57 +48,120 @@ def get_channel_id(url):
                     if 'user/' in content:
                         return content.split('user/')[1].split('/')[0]
     except Exception as e:
-        print(f"Error getting channel ID: {str(e)}")
+        logger.error("Error getting channel ID: %s", e)
     return None
 
-def get_channel_videos(channel_url):
-    """Get list of video URLs from channel using initial page load + AJAX requests"""
-    videos = []
+def uploads_playlist_id(channel_id):
+    """Return the id of a channel's uploads playlist (UC... -> UU...), or None"""
+    if channel_id and channel_id.startswith('UC'):
+        return 'UU' + channel_id[2:]
+    return None
+
+def videos_url(channel_url):
+    """Return the Videos tab URL of a channel"""
+    channel_url = channel_url.split('?')[0].rstrip('/')
+    if not channel_url.endswith('/videos'):
+        channel_url += '/videos'
+    return channel_url
+
+def iter_channel_videos(channel_url):
+    """Yield every video record of a channel's Videos tab in upload order, without duplicates.
+
+    Follows the grid's continuation tokens, so channels with more than one
+    page of uploads are enumerated in full.
+    """
+    count = 0
     try:
-        # Get the initial page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         # First get the channel page
-        response = requests.get(channel_url + "/videos", headers=headers)
+        response = http_client.get(videos_url(channel_url))
         if response.status_code != 200:
-            print("Could not access channel page")
-            return videos
+            logger.error("Could not access channel page")
+            return
 
-        # Parse the initial page
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all script tags that might contain our data
-        scripts = soup.find_all('script')
-        
-        # Extract video URLs from the page
-        for script in scripts:
-            if script.string and 'var ytInitialData = ' in script.string:
-                data_text = script.string.split('var ytInitialData = ')[1].split(';</script>')[0]
-                try:
-                    data = json.loads(data_text)
-                    # Navigate through the JSON structure
-                    tabs = data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])
-                    for tab in tabs:
-                        if 'tabRenderer' in tab and tab['tabRenderer'].get('title') == 'Videos':
-                            items = tab['tabRenderer']['content']['richGridRenderer']['contents']
-                            for item in items:
-                                if 'richItemRenderer' in item:
-                                    video_data = item['richItemRenderer']['content']['videoRenderer']
-                                    video_id = video_data.get('videoId')
-                                    if video_id:
-                                        videos.append(f"https://www.youtube.com/watch?v={video_id}")
-                except Exception as e:
-                    print(f"Error parsing video data: {str(e)}")
-                    continue
-
-        print(f"Found {len(videos)} videos")
-        return list(set(videos))
+        # First grid page from ytInitialData, the rest from browse continuations
+        for video in iter_channel_page_videos(response.content):
+            count += 1
+            yield video
+        if count:
+            debug_capture.sample('channel_videos', response.content, channel_url)
+        else:
+            debug_capture.capture('channel_videos', response.content, "no videos", channel_url)
+
+    except Exception as e:
+        logger.error("Error getting channel videos: %s", e)
+
+    logger.info("Found %s videos", count, extra={'count': count})
 
+def iter_channel_uploads(channel_url, channel_id=None):
+    """Yield every upload of a channel through its uploads playlist.
+
+    One paginated playlist stream covers every video, including those in
+    no playlist. Pass channel_id when it is already known to save the
+    channel page request. Falls back to the Videos tab when the channel
+    id cannot be resolved or the uploads playlist yields nothing.
+    """
+    if not channel_id:
+        channel_id = get_channel_id(channel_url.split('?')[0].rstrip('/'))
+    playlist_id = uploads_playlist_id(channel_id)
+    if not playlist_id:
+        logger.warning("Could not resolve the channel's uploads playlist; reading the Videos tab instead")
+        yield from iter_channel_videos(channel_url)
+        return
+
+    count = 0
+    try:
+        for video in iter_playlist_videos(playlist_id):
+            count += 1
+            yield video
     except Exception as e:
-        print(f"Error getting channel videos: {str(e)}")
-        return videos
+        logger.error("Error reading uploads playlist: %s", e)
+
+    if not count:
+        logger.warning("Uploads playlist is empty or unavailable; reading the Videos tab instead")
+        yield from iter_channel_videos(channel_url)
+        return
+    logger.info("Found %s videos", count, extra={'count': count})
+
+def resolve_channel_id(channel_url, manifest=None):
+    """Return the channel id of a channel URL, remembered in the manifest when given"""
+    channel_url = channel_url.split('?')[0].rstrip('/')
+    channel_id = manifest.get_channel_id(channel_url) if manifest else None
+    if channel_id:
+        return channel_id
+    channel_id = get_channel_id(channel_url)
+    if manifest and channel_id and channel_id.startswith('UC'):
+        manifest.record_channel_id(channel_url, channel_id)
+    return channel_id
+
+def iter_channel_sync(channel_url, manifest):
+    """Yield only the uploads a previous run has not seen, read from the channel feed.
+
+    The feed lists the latest FEED_WINDOW uploads. When it is full and no
+    earlier run came across its oldest entry, uploads may have been missed
+    beyond the window, so the full uploads crawl runs instead; it does the
+    same when the feed cannot be read. Feed entries that failed before are
+    offered again. Already downloaded videos are skipped by download_videos
+    either way.
+    """
+    channel_id = resolve_channel_id(channel_url, manifest)
+    videos = fetch_feed(channel_id) if channel_id else None
+    if videos is None:
+        logger.warning("Channel feed unavailable; running a full crawl")
+        yield from iter_channel_uploads(channel_url, channel_id)
+        return
+
+    if len(videos) >= FEED_WINDOW and not manifest.is_seen(videos[-1]['id']):
+        logger.info("The channel feed holds only new uploads; running a full crawl to cover any beyond it")
+        yield from iter_channel_uploads(channel_url, channel_id)
+        return
+
+    new_videos = [video for video in videos if not manifest.is_known(video['id'])]
+    logger.info("Found %s new or previously failed uploads in the channel feed", len(new_videos), extra={'count': len(new_videos)})
+    yield from new_videos
+
+def get_channel_videos(channel_url):
+    """Get list of video records from channel"""
+    return list(iter_channel_videos(channel_url))
 
 def get_safe_filename(title):
     """Convert title to safe filename"""
@@ -88,110 +173,77 @@ def get_video_title(video_id):
     """Get video title using YouTube's oEmbed API"""
     try:
         oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        response = http_client.get(oembed_url)
         if response.status_code == 200:
             return response.json()['title']
     except Exception:
         pass
     return video_id
 
-def get_transcript(video_id):
-    """Try to get transcript in any available language"""
-    try:
-        # First try to get all available transcripts
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        print("\nAvailable transcript languages:")
-        for transcript in transcript_list:
-            print(f"- {transcript.language} ({'Auto-generated' if transcript.is_generated else 'Manual'})")
-        
-        # Try to get English transcript first
-        try:
-            return transcript_list.find_transcript(['en']).fetch()
-        except:
-            try:
-                # Try to get auto-generated English
-                return transcript_list.find_generated_transcript(['en']).fetch()
-            except:
-                pass
-        
-        # Try to get Hindi transcript (since the video is in Hindi)
-        try:
-            return transcript_list.find_transcript(['hi']).fetch()
-        except:
-            try:
-                # Try to get auto-generated Hindi
-                return transcript_list.find_generated_transcript(['hi']).fetch()
-            except:
-                pass
-        
-        # Try to get any manual transcript
-        try:
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                print(f"\nUsing manual transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-        
-        # If nothing else works, get the first available transcript
-        try:
-            available = list(transcript_list)
-            if available:
-                transcript = available[0]
-                print(f"\nUsing available transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-            
-    except Exception as e:
-        if "No transcripts were found" in str(e):
-            print("\nNo transcripts available for this video")
-        else:
-            print(f"\nError getting transcript: {str(e)}")
-    return None
+def get_transcript(video_id, manifest=None):
+    """Get the transcript picked by TRACK_POLICY, in any available language.
 
-def download_video_transcript(video_url, output_dir):
-    """Download transcript for a single video"""
+    Returns (transcript, language_code), or (None, None) if nothing is available.
+    """
+    return fetch_transcript(video_id, TRACK_POLICY, manifest)
+
+def download_video_transcript(video, output_dir, manifest=None):
+    """Download transcript for a single video record or watch URL, recording the outcome in the manifest if given"""
+    video_id = None
     try:
         # Get video ID
-        if 'watch?v=' in video_url:
-            video_id = video_url.split('watch?v=')[1].split('&')[0]
-        else:
-            print(f"Invalid video URL: {video_url}")
+        video = as_record(video)
+        video_id = video['id']
+        if not video_id:
+            logger.warning("Invalid video URL: %s", video['url'])
+            return False
+        if manifest and manifest.is_unavailable(video_id):
+            logger.debug("Skipping video without transcripts: %s", video['title'] or video_id)
             return False
 
-        # Get video title
-        video_title = get_video_title(video_id)
-        safe_title = get_safe_filename(video_title)
-        print(f"\nProcessing video: {video_title}")
+        # A transcript saved by an earlier run only needs the formats it is missing
+        saved = manifest.completed_path(video_id) if manifest else None
+        if saved:
+            base = output_writers.saved_base(saved, output_dir)
+            formats = output_writers.missing_formats(base, OUTPUT_FORMATS)
+            if not formats:
+                return True
+            logger.debug("Adding %s output for: %s", ', '.join(formats), base)
+        else:
+            # Use the title from enumeration; oEmbed only when it is missing
+            video_title = video['title'] or get_video_title(video_id)
+            base = os.path.join(output_dir, get_safe_filename(video_title))
+            formats = OUTPUT_FORMATS
+            logger.debug("Processing video: %s", video_title)
 
-        # Get transcript
-        transcript = get_transcript(video_id)
+        # Get transcript, from a saved JSONL copy when there is one
+        transcript = output_writers.load_segments(base) if saved else None
+        if transcript is not None:
+            language = manifest.get(video_id)['language']
+        else:
+            transcript, language = get_transcript(video_id, manifest)
         if not transcript:
-            print("Could not get transcript (no captions available in any language)")
+            logger.debug("Could not get transcript for %s (no captions available in any language)", video_id)
+            # keep the completed entry of a transcript saved before
+            if manifest and not saved:
+                manifest.mark_failed(video_id, "no transcript")
             return False
 
-        # Format transcript
-        formatted_transcript = []
-        for entry in transcript:
-            time = f"[{int(entry['start']//60):02d}:{int(entry['start']%60):02d}]"
-            formatted_transcript.append(f"{time} {entry['text']}")
-
-        # Save to file
-        filename = os.path.join(output_dir, f"{safe_title}_transcript.txt")
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(formatted_transcript))
+        # Format and save, one pass over the segments for all missing OUTPUT_FORMATS
+        outputs = output_writers.write_transcript(transcript, base, OUTPUT_FORMATS, only=formats)
+        if manifest:
+            manifest.mark_written(video_id, language, outputs[0]['path'], outputs[0]['sha256'], sum(output['bytes'] for output in outputs))
         
-        print(f"Transcript saved to: {filename}")
+        logger.debug("Transcript saved to: %s", ', '.join(output['path'] for output in outputs), extra={'video_id': video_id})
         return True
 
     except Exception as e:
-        print(f"Error processing video: {str(e)}")
+        logger.error("Error processing video: %s", e, extra={'video_id': video_id})
+        if manifest and video_id:
+            manifest.mark_failed(video_id, str(e))
         return False
 
-def process_channel():
+def process_channel(max_workers=DEFAULT_WORKERS, manifest=None):
     try:
         # Get channel URL
         print("\nPlease enter the YouTube channel URL (or 'q' to quit):")
@@ -205,42 +257,55 @@ def process_channel():
             print("No URL provided. Please try again or enter 'q' to quit.")
             return True
         
+        transcribe_channel(channel_url, max_workers, manifest)
+        return True
+
+    except Exception as e:
+        print(f"\nAn unexpected error occurred: {str(e)}")
+        print("Please try again with a different channel URL.")
+        return True
+
+def transcribe_channel(channel_url, max_workers=DEFAULT_WORKERS, manifest=None, executor=None, use_uploads=True, incremental=False):
+    """Download the transcripts of every video on a channel without prompting.
+
+    Videos come from the channel's uploads playlist, or from the Videos tab
+    when use_uploads is False. With incremental set, only uploads listed in
+    the channel feed and not yet in the manifest are fetched. Returns (successful, failed, results) as
+    download_videos does; results is empty when no videos were found.
+    """
+    try:
         # Create output directory
         channel_name = channel_url.rstrip('/').split('/')[-1]
         output_dir = get_safe_filename(channel_name)
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        print(f"\nGetting videos from channel: {channel_url}")
-        videos = get_channel_videos(channel_url)
-        
-        if not videos:
-            print("No videos found in the channel.")
-            return True
-        
-        print(f"\nFound {len(videos)} videos. Starting transcript download...")
+        logger.info("Getting videos from channel: %s", channel_url)
+        if manifest is None:
+            manifest = RunManifest()
+        if incremental:
+            source = iter_channel_sync(channel_url, manifest)
+        elif use_uploads:
+            source = iter_channel_uploads(channel_url, resolve_channel_id(channel_url, manifest))
+        else:
+            source = iter_channel_videos(channel_url)
+        videos = with_titles(source, get_video_title, manifest)
+        logger.info("Starting transcript download...")
         
-        successful = 0
-        failed = 0
+        successful, failed, results = download_videos(videos, output_dir, download_video_transcript, max_workers, manifest, executor, OUTPUT_FORMATS)
         
-        for i, video_url in enumerate(videos, 1):
-            print(f"\nProcessing video {i}/{len(videos)}")
-            if download_video_transcript(video_url, output_dir):
-                successful += 1
-            else:
-                failed += 1
-            time.sleep(1)  # Add delay to avoid rate limiting
+        if not results:
+            logger.warning("No new uploads since the last sync." if incremental else "No videos found in the channel.")
+            return successful, failed, results
         
-        print(f"\nDownload complete!")
-        print(f"Successfully downloaded: {successful} transcripts")
-        print(f"Failed to download: {failed} transcripts")
-        print(f"Transcripts are saved in the '{output_dir}' directory")
-        return True
+        logger.info("Download complete! Successfully downloaded: %s, failed: %s. Transcripts are saved in the '%s' directory",
+                    successful, failed, output_dir,
+                    extra={'successful': successful, 'failed': failed, 'output_dir': output_dir})
+        return successful, failed, results
 
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {str(e)}")
-        print("Please try again with a different channel URL.")
-        return True
+        logger.error("An unexpected error occurred: %s", e)
+        return 0, 0, []
 
 if __name__ == "__main__":
     print("YouTube Channel Transcript Downloader")
@@ -0,0 +1,219 @@
+import argparse
+import sys
+
+# Single non-interactive entry point for the transcript downloaders:
+#
+#   python cli.py video URL
+#   python cli.py playlist URL [--workers N]
+#   python cli.py channel URL [--sync]
+#   python cli.py channel-playlists URL
+#   python cli.py batch FILE|- [--report report.json]
+#
+# Only argparse is imported up front. Each subcommand imports the modules
+# its own code path needs, so --help and usage errors return before
+# requests or the transcript API are loaded, and a single-video job never
+# loads the channel or playlist code.
+#
+# Progress is logged to stderr: stage summaries by default, every video
+# with -v, warnings and errors only with -q, JSON lines with --log-json.
+# --metrics-port serves live Prometheus metrics and --metrics-json dumps
+# them when the run ends. --profile times each pipeline stage (fetch,
+# parse, decode, transcript calls, formatting, writes) and --cprofile
+# saves pstats output for the whole run. --debug-capture keeps the pages
+# that extraction failed on; nothing is dumped to disk otherwise.
+# --format picks the files saved per video (text, lines, timestamped,
+# jsonl, srt, vtt); several formats are written from one fetch.
+
+def logger():
+    import log
+    return log.get_logger('cli')
+
+def configure_logging(args):
+    import log
+    level = 'debug' if args.verbose else 'warning' if args.quiet else 'info'
+    log.configure(level, json_mode=args.log_json)
+
+def open_manifest(args):
+    from manifest import RunManifest, DEFAULT_PATH, UNAVAILABLE_TTL
+    return RunManifest(args.manifest or DEFAULT_PATH, args.unavailable_ttl or UNAVAILABLE_TTL)
+
+def ttl_arg(text):
+    """Parse a duration like 7d, 12h or 3 (days) into seconds"""
+    units = {'d': 24 * 3600, 'h': 3600}
+    text = text.strip().lower()
+    unit = units['d']
+    if text[-1:] in units:
+        unit = units[text[-1]]
+        text = text[:-1]
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration '{text}' (use e.g. 7d or 12h)")
+    if value <= 0:
+        raise argparse.ArgumentTypeError("duration must be positive")
+    return value * unit
+
+def workers(args):
+    from download_engine import DEFAULT_WORKERS
+    return args.workers or DEFAULT_WORKERS
+
+def policy_arg(text):
+    from transcript_selection import parse_policy
+    try:
+        return parse_policy(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def formats_arg(text):
+    from output_writers import parse_formats
+    try:
+        return parse_formats(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def apply_options(args, module):
+    """Apply the options shared by every subcommand; module is the one whose TRACK_POLICY and OUTPUT_FORMATS they override"""
+    if args.no_cache:
+        import http_cache
+        http_cache.configure(enabled=False)
+    if args.debug_capture:
+        import debug_capture
+        debug_capture.configure(enabled=True, directory=args.debug_capture, max_captures=args.debug_keep, sample_rate=args.debug_sample)
+    if module is None:
+        # batch runs several downloaders; set the options on each of them
+        import playlist_transcriber
+        import channel_transcriber
+        downloaders = (playlist_transcriber, channel_transcriber)
+    else:
+        downloaders = (module,)
+    for downloader in downloaders:
+        if args.policy:
+            downloader.TRACK_POLICY = args.policy
+        if args.format:
+            downloader.OUTPUT_FORMATS = args.format
+
+def run_video(args):
+    import youtube_transcriber
+    apply_options(args, youtube_transcriber)
+    return youtube_transcriber.process_url(args.url)
+
+def run_playlist(args):
+    import playlist_transcriber
+    apply_options(args, playlist_transcriber)
+    _, _, results = playlist_transcriber.transcribe_playlist(args.url, workers(args), open_manifest(args))
+    return bool(results)
+
+def run_channel(args):
+    import channel_transcriber
+    apply_options(args, channel_transcriber)
+    if args.feed_url:
+        import channel_feed
+        channel_feed.FEED_URL = args.feed_url
+    _, _, results = channel_transcriber.transcribe_channel(args.url, workers(args), open_manifest(args), use_uploads=not args.videos_tab, incremental=args.sync)
+    # a sync with nothing new to fetch is a success
+    return bool(results) or args.sync
+
+def run_channel_playlists(args):
+    import playlist_transcriber
+    import channel_playlist_transcriber
+    # channel playlists are downloaded with playlist_transcriber's download_video_transcript
+    apply_options(args, playlist_transcriber)
+    successful, failed = channel_playlist_transcriber.process_channel_playlists(args.url, workers(args), open_manifest(args))
+    return successful + failed > 0
+
+def run_batch(args):
+    import batch
+    apply_options(args, None)
+    if args.source == '-':
+        jobs = batch.read_jobs(sys.stdin)
+    else:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            jobs = batch.read_jobs(f)
+    if not jobs:
+        logger().error("No YouTube URLs to process.")
+        return False
+    logger().info("Processing %d unique URLs", len(jobs), extra={'count': len(jobs)})
+    report = batch.run_batch(jobs, workers(args), open_manifest(args), args.jobs or batch.DEFAULT_JOBS)
+    batch.write_report(report, args.report)
+    return report['totals']['failed_jobs'] == 0
+
+COMMANDS = {
+    'video': (run_video, "download the transcript of one video"),
+    'playlist': (run_playlist, "download every transcript of a playlist"),
+    'channel': (run_channel, "download the transcripts of a channel's videos"),
+    'channel-playlists': (run_channel_playlists, "download every playlist of a channel, each video once"),
+}
+
+def add_common_options(sub, downloads=True):
+    """Add the shared options; downloads=False leaves out the worker pool and manifest ones"""
+    if downloads:
+        sub.add_argument('--workers', type=int, help="concurrent downloads (default 4)")
+        sub.add_argument('--manifest', help="run manifest database (default transcripts_manifest.sqlite3)")
+        sub.add_argument('--unavailable-ttl', type=ttl_arg, metavar='DURATION',
+                         help="how long videos without captions are skipped before being checked again, e.g. 7d or 12h (default 7d)")
+    sub.add_argument('--no-cache', action='store_true', help="do not use the on-disk HTTP cache")
+    sub.add_argument('--policy', type=policy_arg, help="transcript track policy, e.g. manual:en,generated:en,any")
+    sub.add_argument('--format', type=formats_arg, metavar='FORMATS',
+                     help="output formats written in one pass (text, lines, timestamped, jsonl, srt, vtt), e.g. text,srt")
+    verbosity = sub.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_true', help="log every video and link, not just stage summaries")
+    verbosity.add_argument('-q', '--quiet', action='store_true', help="log only warnings and errors")
+    sub.add_argument('--log-json', action='store_true', help="write log records to stderr as JSON lines")
+    sub.add_argument('--metrics-port', type=int, help="serve Prometheus metrics on 127.0.0.1:PORT/metrics during the run")
+    sub.add_argument('--metrics-json', help="write request, latency, throughput and failure metrics as JSON at the end (- for stdout)")
+    sub.add_argument('--profile', nargs='?', const="profile_report.json", metavar='PATH',
+                     help="time each pipeline stage and write a p50/p95/total breakdown (default profile_report.json)")
+    sub.add_argument('--cprofile', metavar='PATH', help="also save cProfile stats from every thread, for python -m pstats")
+    sub.add_argument('--debug-capture', nargs='?', const=".debug_captures", metavar='DIR',
+                     help="keep pages that extraction failed on in a ring directory (default .debug_captures)")
+    sub.add_argument('--debug-keep', type=int, metavar='N', help="captures kept in the ring directory (default 20)")
+    sub.add_argument('--debug-sample', type=float, metavar='RATE', help="also capture this fraction of pages that parsed fine")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Download YouTube transcripts")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, (func, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('url', help="YouTube URL")
+        # a single video goes through youtube_transcriber directly, without the worker pool or manifest
+        add_common_options(sub, downloads=name != 'video')
+        sub.set_defaults(func=func)
+        if name == 'channel':
+            sub.add_argument('--videos-tab', action='store_true', help="enumerate the Videos tab instead of the uploads playlist")
+            sub.add_argument('--sync', action='store_true', help="only fetch uploads listed in the channel feed that earlier runs have not seen")
+            sub.add_argument('--feed-url', help="channel feed URL template with {channel_id} (default: YouTube's feeds/videos.xml)")
+
+    sub = subparsers.add_parser('batch', help="process a file of mixed video, playlist and channel URLs")
+    sub.add_argument('source', help="file with one URL per line, or - for stdin")
+    sub.add_argument('--report', default="batch_report.json", help="where to write the JSON report (- for stdout)")
+    sub.add_argument('--jobs', type=int, help="playlists/channels enumerated at once (default 2)")
+    add_common_options(sub)
+    sub.set_defaults(func=run_batch)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_logging(args)
+    if args.metrics_port:
+        import metrics
+        metrics.serve(args.metrics_port)
+        logger().info("Serving metrics on http://127.0.0.1:%d/metrics", args.metrics_port)
+    if args.profile or args.cprofile:
+        import profiling
+        if args.profile:
+            profiling.enable()
+        if args.cprofile:
+            profiling.start_cprofile()
+    try:
+        return 0 if args.func(args) else 1
+    finally:
+        if args.cprofile:
+            profiling.stop_cprofile(args.cprofile)
+        if args.profile:
+            profiling.write_report(args.profile)
+        if args.metrics_json:
+            import metrics
+            metrics.dump(args.metrics_json)
+
+if __name__ == "__main__":
+    sys.exit(main())
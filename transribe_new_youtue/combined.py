@@ -1,67 +1,33 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import time
+import argparse
 import re
 import os
-import requests
-from pytube import Playlist, YouTube
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+import http_client
+from transcript_selection import fetch_transcript as select_transcript, DEFAULT_POLICY
 from urllib.parse import urlparse, parse_qs
+from manifest import RunManifest
+from playlist_discovery import get_playlist_links
+import log
+import output_writers
+import profiling
+
+logger = log.get_logger(__name__)
+
+TRACK_POLICY = DEFAULT_POLICY
+
+# Files written per video, by output_writers name; the first one is recorded in the manifest
+OUTPUT_FORMATS = ('lines',)
 
 #########################################
-# Part 1: Extract Playlist Links via Selenium
+# Part 1: Extract Playlist Links
 #########################################
 
-def scroll_down(driver, pause_time=2):
-    """Scrolls down the page until no new content is loaded."""
-    last_height = driver.execute_script("return document.documentElement.scrollHeight")
-    while True:
-        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-        time.sleep(pause_time)
-        new_height = driver.execute_script("return document.documentElement.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-
-def get_all_playlist_links(channel_url):
+def get_all_playlist_links(channel_url, selenium_fallback=False):
     """
-    Uses Selenium to load the full channel playlists page and extracts all playlist URLs.
-    Returns a list of full playlist URLs.
+    Lists all playlist URLs of a channel over plain HTTP, following the
+    playlists tab's continuation pages. The Selenium scroll loop is only
+    used when selenium_fallback is set and nothing was found.
     """
-    # Set up headless Chrome
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    
-    driver = webdriver.Chrome(options=options)
-    driver.get(channel_url)
-    
-    # Allow initial content to load
-    time.sleep(3)
-    # Scroll to fully load the page
-    scroll_down(driver, pause_time=2)
-    
-    # Get the fully loaded page source
-    html = driver.page_source
-    driver.quit()
-    
-    # Parse the page source with BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
-    links = soup.find_all("a", href=True)
-    
-    playlist_links = set()
-    # Look for links that include both "/watch?v=" and "list="
-    for link in links:
-        href = link["href"]
-        if "/watch?v=" in href and "list=" in href:
-            match = re.search(r"list=([\w-]+)", href)
-            if match:
-                playlist_id = match.group(1)
-                playlist_links.add(f"https://www.youtube.com/playlist?list={playlist_id}")
-                
-    return list(playlist_links)
+    return get_playlist_links(channel_url, selenium_fallback)
 
 #########################################
 # Part 2: Download Transcripts for Each Playlist
@@ -82,117 +48,78 @@ def get_video_title(video_id):
     """Fetches video title using YouTube's oEmbed API."""
     try:
         oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        response = http_client.get(oembed_url)
         if response.status_code == 200:
             return response.json()['title']
     except Exception:
         pass
     return video_id  # Fallback to video ID if title retrieval fails
 
-def fetch_transcript(video_id):
+def fetch_transcript(video_id, manifest=None):
     """
-    Fetches transcript for a given video ID.
-    Attempts manual English first, then auto-generated English.
-    If unavailable, tries any available manual transcript (translating to English if possible),
-    and finally falls back to the first available transcript in any language.
+    Fetches transcript for a given video ID as (transcript, language_code).
+    The track is chosen by TRACK_POLICY: manual English, auto-generated English,
+    a manual transcript translated to English, then any available transcript.
     """
-    try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        print("\nAvailable transcript languages:")
-        for transcript in transcript_list:
-            print(f"- {transcript.language} ({'Auto-generated' if transcript.is_generated else 'Manual'})")
-        
-        # Priority 1: Manual English transcript
-        try:
-            transcript = transcript_list.find_transcript(['en'])
-            if not transcript.is_generated:
-                print("\nUsing manual English transcript")
-                return transcript.fetch()
-        except Exception:
-            pass
-        
-        # Priority 2: Auto-generated English transcript
-        try:
-            transcript = transcript_list.find_generated_transcript(['en'])
-            print("\nUsing auto-generated English transcript")
-            return transcript.fetch()
-        except Exception:
-            pass
-        
-        # Priority 3: Try any available manual transcript; attempt translation to English
-        try:
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                try:
-                    translated = transcript.translate('en')
-                    print(f"\nUsing translated manual transcript from {transcript.language} to English")
-                    return translated.fetch()
-                except Exception:
-                    print(f"\nUsing original manual transcript in {transcript.language}")
-                    return transcript.fetch()
-        except Exception:
-            pass
-        
-        # Priority 4: Use the first available transcript (regardless of language)
-        try:
-            available = list(transcript_list)
-            if available:
-                transcript = available[0]
-                print(f"\nUsing available transcript in {transcript.language}")
-                return transcript.fetch()
-        except Exception:
-            pass
-        
-        print(f"\nNo transcripts available for video ID: {video_id}")
-        return None
-        
-    except Exception as e:
-        if "No transcripts were found" in str(e):
-            print(f"\nNo transcripts available for video ID: {video_id}")
-        else:
-            print(f"\nError fetching transcript for video ID {video_id}: {e}")
-        return None
+    transcript, language = select_transcript(video_id, TRACK_POLICY, manifest)
+    if not transcript:
+        logger.debug("No transcripts available for video ID: %s", video_id)
+    return transcript, language
 
 def save_transcript(transcript, title, output_dir):
-    """Saves the transcript to a text file inside the specified directory."""
+    """
+    Saves the transcript in every OUTPUT_FORMATS format inside the specified directory.
+    Returns the output_writers.write_transcript results.
+    """
     safe_title = get_safe_filename(title)
-    filename = os.path.join(output_dir, f"{safe_title}_transcript.txt")
-    with open(filename, 'w', encoding='utf-8') as file:
-        for entry in transcript:
-            file.write(f"{entry['text']}\n")
-    print(f"Transcript saved: {filename}")
-
-def process_video(video_url, output_dir):
-    """Processes a single video: fetches its transcript and saves it."""
+    outputs = output_writers.write_transcript(transcript, os.path.join(output_dir, safe_title), OUTPUT_FORMATS)
+    logger.debug("Transcript saved: %s", ', '.join(output['path'] for output in outputs))
+    return outputs
+
+def process_video(video_url, output_dir, manifest=None):
+    """
+    Processes a single video: fetches its transcript and saves it.
+    Videos the manifest lists as completed are skipped.
+    """
     try:
         video_id = get_video_id(video_url)
         if not video_id:
-            print(f"Error extracting video ID for URL: {video_url}")
+            logger.warning("Error extracting video ID for URL: %s", video_url)
+            return
+        if manifest and manifest.is_completed(video_id, output_dir, OUTPUT_FORMATS):
+            logger.debug("Skipping already downloaded video: %s", video_url)
+            return
+        if manifest and manifest.is_unavailable(video_id):
+            logger.debug("Skipping video without transcripts: %s", video_url)
             return
         
         title = get_video_title(video_id)
-        print(f"\nProcessing video: {title}")
-        transcript = fetch_transcript(video_id)
+        logger.debug("Processing video: %s", title)
+        transcript, language = fetch_transcript(video_id, manifest)
         if transcript:
-            save_transcript(transcript, title, output_dir)
+            outputs = save_transcript(transcript, title, output_dir)
+            if manifest:
+                manifest.mark_written(video_id, language, outputs[0]['path'], outputs[0]['sha256'], sum(output['bytes'] for output in outputs))
         else:
-            print(f"Skipping video '{title}' due to missing transcript.")
+            logger.info("Skipping video '%s' due to missing transcript.", title)
+            if manifest:
+                manifest.mark_failed(video_id, "no transcript")
     except Exception as e:
-        print(f"Error processing video {video_url}: {e}")
+        logger.error("Error processing video %s: %s", video_url, e)
 
-def download_playlist_transcripts(playlist_url, output_dir=None):
+def download_playlist_transcripts(playlist_url, output_dir=None, manifest=None):
     """
     Extracts videos from a playlist and processes them for transcripts.
     If output_dir is not specified, uses the playlist title as folder name.
     """
     try:
+        from pytube import Playlist
         playlist = Playlist(playlist_url)
         # Fix for pytube extraction issues
         playlist._video_regex = re.compile(r"\"url\":\"(/watch\?v=[\w-]*)")
         
         if not playlist.video_urls:
-            print("No videos found in the playlist. Please check the URL or playlist privacy settings.")
+            logger.warning("No videos found in the playlist. Please check the URL or playlist privacy settings.")
             return
 
         # Use playlist title as folder name if output_dir is not provided
@@ -202,27 +129,31 @@ def download_playlist_transcripts(playlist_url, output_dir=None):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        print(f"\nFound {len(playlist.video_urls)} videos in playlist: {playlist.title}")
+        logger.info("Found %s videos in playlist: %s", len(playlist.video_urls), playlist.title)
         for video_url in playlist.video_urls:
-            process_video(video_url, output_dir)
-            time.sleep(1)  # Pause briefly to prevent rate limiting
+            process_video(video_url, output_dir, manifest)
     except Exception as e:
-        print(f"Error processing playlist: {e}")
+        logger.error("Error processing playlist: %s", e)
 
 #########################################
 # Main: Combine Everything
 #########################################
 
-if __name__ == "__main__":
+def main():
+    """Ask for a channel and download the transcripts of all its playlists"""
     # Step 1: Ask for the channel playlists URL
     channel_url = input("Enter the channel playlists URL (e.g., https://www.youtube.com/@SRMD/playlists): ").strip()
     if not channel_url:
         print("No channel URL provided. Exiting.")
         exit(1)
 
-    # Extract all playlist links from the channel using Selenium
-    print("\nExtracting all playlist links from the channel...")
+    # Extract all playlist links from the channel over HTTP
+    logger.info("Extracting all playlist links from the channel...")
     playlist_links = get_all_playlist_links(channel_url)
+    if not playlist_links:
+        fallback_choice = input("\nNo playlists found over HTTP. Try the (slow) Selenium browser fallback? (yes/no): ").strip().lower()
+        if fallback_choice in ['yes', 'y']:
+            playlist_links = get_all_playlist_links(channel_url, selenium_fallback=True)
     if playlist_links:
         print(f"\nFound {len(playlist_links)} playlists:")
         for idx, pl in enumerate(playlist_links, start=1):
@@ -237,9 +168,29 @@ if __name__ == "__main__":
         print("Exiting without downloading transcripts.")
         exit(0)
 
-    # Process each playlist sequentially
+    # Process each playlist sequentially, skipping videos finished in earlier runs
+    manifest = RunManifest()
     for playlist_link in playlist_links:
-        print(f"\nProcessing playlist: {playlist_link}")
-        download_playlist_transcripts(playlist_link)
-    
-    print("\nAll playlists processed.")
+        logger.info("Processing playlist: %s", playlist_link)
+        download_playlist_transcripts(playlist_link, manifest=manifest)
+
+    logger.info("All playlists processed.")
+
+if __name__ == "__main__":
+    # --profile [PATH] times each stage of the run, --cprofile PATH saves pstats output
+    parser = argparse.ArgumentParser(description="Download the transcripts of every playlist of a channel")
+    parser.add_argument('--profile', nargs='?', const="profile_report.json", metavar='PATH',
+                        help="time each pipeline stage and write a p50/p95/total breakdown (default profile_report.json)")
+    parser.add_argument('--cprofile', metavar='PATH', help="also save cProfile stats from every thread, for python -m pstats")
+    options = parser.parse_args()
+    if options.profile:
+        profiling.enable()
+    if options.cprofile:
+        profiling.start_cprofile()
+    try:
+        main()
+    finally:
+        if options.cprofile:
+            profiling.stop_cprofile(options.cprofile)
+        if options.profile:
+            profiling.write_report(options.profile)
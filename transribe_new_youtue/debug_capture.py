@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import threading
+import time
+import log
+
+logger = log.get_logger(__name__)
+
+# Opt-in capture of pages the scrapers could not make sense of. Off by
+# default: nothing is written during normal runs. When enabled, a page is
+# saved only when extraction from it failed (plus, optionally, a random
+# sample of pages that worked), into a ring directory that keeps the
+# last MAX_CAPTURES captures and deletes older ones.
+#
+#   debug_capture.configure(enabled=True)
+#   ...
+#   if not videos:
+#       debug_capture.capture('playlist_page', response.content, "no video links", url)
+
+ENABLED = False
+CAPTURE_DIR = ".debug_captures"
+MAX_CAPTURES = 20
+SAMPLE_RATE = 0.0  # fraction of successful pages also captured
+
+_lock = threading.Lock()
+_sequence = 0
+
+def configure(enabled=None, directory=None, max_captures=None, sample_rate=None):
+    """Turn capturing on/off, move the ring directory or change its size"""
+    global ENABLED, CAPTURE_DIR, MAX_CAPTURES, SAMPLE_RATE
+    with _lock:
+        if enabled is not None:
+            ENABLED = enabled
+        if directory is not None:
+            CAPTURE_DIR = directory
+        if max_captures is not None:
+            MAX_CAPTURES = max_captures
+        if sample_rate is not None:
+            SAMPLE_RATE = sample_rate
+
+def _prune():
+    """Delete the oldest captures beyond MAX_CAPTURES"""
+    names = sorted(name for name in os.listdir(CAPTURE_DIR) if name.endswith('.json'))
+    for name in names[:max(0, len(names) - MAX_CAPTURES)]:
+        stem = name[:-len('.json')]
+        for leftover in (name, stem + '.html'):
+            try:
+                os.remove(os.path.join(CAPTURE_DIR, leftover))
+            except OSError:
+                pass
+
+def capture(kind, content, reason, url=None):
+    """Save a page that extraction failed on, with a small JSON note; returns the path or None"""
+    global _sequence
+    if not ENABLED or content is None:
+        return None
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    try:
+        with _lock:
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            _sequence += 1
+            # time first so names sort oldest first across runs
+            stem = os.path.join(CAPTURE_DIR, f"{time.time_ns()}_{_sequence:04d}_{kind}")
+            with open(stem + '.html', 'wb') as f:
+                f.write(content)
+            with open(stem + '.json', 'w', encoding='utf-8') as f:
+                json.dump({'kind': kind, 'reason': reason, 'url': url, 'captured_at': time.time(), 'bytes': len(content)}, f)
+            _prune()
+    except OSError as e:
+        logger.warning("Could not save debug capture: %s", e)
+        return None
+    logger.info("Saved %s to %s for debugging (%s)", kind, stem + '.html', reason)
+    return stem + '.html'
+
+def sample(kind, content, url=None):
+    """Capture a page that was parsed fine, at SAMPLE_RATE"""
+    if ENABLED and SAMPLE_RATE and random.random() < SAMPLE_RATE:
+        return capture(kind, content, "sampled", url)
+    return None
@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import log
+import metrics
+import output_writers
+
+logger = log.get_logger(__name__)
+
+DEFAULT_WORKERS = 4
+PROGRESS_EVERY = 25  # log a progress line after this many finished downloads
+
+def get_video_id(video):
+    """Extract the video ID from a video record or a watch URL"""
+    if isinstance(video, dict):
+        return video.get('id')
+    if 'watch?v=' in video:
+        return video.split('watch?v=')[1].split('&')[0]
+    return None
+
+def download_videos(videos, output_dir, download_func, max_workers=DEFAULT_WORKERS, manifest=None, executor=None, formats=None):
+    """Download transcripts for many videos with a bounded worker pool.
+
+    videos are video records (see enumeration.py) or watch URLs, as a
+    list or a generator that is still enumerating; work starts as soon
+    as the first video arrives and at most 2 * max_workers videos are
+    queued ahead of the workers. Request pacing is left to the rate
+    limiter. Videos the manifest already lists as completed, or as
+    recently found to have no captions, are skipped without a request,
+    and the manifest is handed to download_func to record each outcome.
+    A video completed into another directory is linked into output_dir
+    rather than downloaded again. With formats (output_writers names), a
+    completed video missing any of them still goes to download_func,
+    which only adds the missing files.
+    Pass executor to share one worker pool between several concurrent
+    calls; it is left running afterwards.
+
+    Returns (successful, failed, results) where results is a list of
+    (video, ok) pairs in the original playlist order. Completed videos
+    count as ok; videos without captions count as not ok but are left
+    out of the failed total.
+    """
+    total = len(videos) if hasattr(videos, '__len__') else None
+    extra = {'manifest': manifest} if manifest else {}
+    finished = [0, 0]  # downloads done, of which ok
+    progress_lock = threading.Lock()
+
+    def worker(index, video):
+        logger.debug("Processing video %s/%s", index, total or '?', extra={'index': index})
+        try:
+            ok = bool(download_func(video, output_dir, **extra))
+        except Exception as e:
+            logger.error("Error processing video: %s", e, extra={'video_id': get_video_id(video)})
+            ok = False
+        with progress_lock:
+            finished[0] += 1
+            finished[1] += ok
+            if finished[0] % PROGRESS_EVERY == 0:
+                logger.info("Progress: %d downloads finished, %d ok", finished[0], finished[1],
+                            extra={'finished': finished[0], 'ok': finished[1], 'output_dir': output_dir})
+        return ok
+
+    # entries hold a future, or True/False for videos skipped as
+    # completed/unavailable
+    entries = []
+    pending = set()
+    skipped = 0
+    linked = 0
+    incomplete = 0
+    unavailable = 0
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for i, video in enumerate(videos, 1):
+            saved = manifest.completed_path(get_video_id(video)) if manifest else None
+            was_linked = False
+            if saved and not manifest.is_completed(get_video_id(video), output_dir):
+                # saved for another playlist or channel: give output_dir its own copy
+                try:
+                    output_writers.link_outputs(saved, output_dir)
+                    was_linked = True
+                except OSError as e:
+                    logger.warning("Could not link %s into %s: %s", saved, output_dir, e)
+                    saved = None
+            if saved and output_writers.missing_formats(output_writers.saved_base(saved, output_dir), formats):
+                incomplete += 1
+            elif saved:
+                entries.append((video, True))
+                if was_linked:
+                    linked += 1
+                    metrics.inc('videos_skipped_total', reason='linked')
+                else:
+                    skipped += 1
+                    metrics.inc('videos_skipped_total', reason='completed')
+                continue
+            if manifest and manifest.is_unavailable(get_video_id(video)):
+                entries.append((video, False))
+                unavailable += 1
+                metrics.inc('videos_skipped_total', reason='unavailable')
+                continue
+            if len(pending) >= max_workers * 2:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            future = executor.submit(worker, i, video)
+            pending.add(future)
+            entries.append((video, future))
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    if skipped:
+        logger.info("Skipped %d videos already downloaded in a previous run", skipped, extra={'skipped': skipped})
+    if linked:
+        logger.info("Linked %d transcripts saved for another playlist or channel", linked, extra={'linked': linked})
+    if incomplete:
+        logger.info("Adding missing output formats for %d videos downloaded before", incomplete, extra={'incomplete': incomplete})
+    if unavailable:
+        logger.info("Skipped %d videos known to have no transcripts", unavailable, extra={'unavailable': unavailable})
+
+    results = [(video, entry if isinstance(entry, bool) else entry.result()) for video, entry in entries]
+    outcomes = [entry.result() for _, entry in entries if not isinstance(entry, bool)]
+    successful = sum(1 for ok in outcomes if ok)
+    failed = len(outcomes) - successful
+    return successful, failed, results
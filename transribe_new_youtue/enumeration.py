@@ -0,0 +1,163 @@
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+from innertube import extract_client_config, iter_continuation_items
+from yt_initial_data import extract_initial_data, get_playlist_contents, get_channel_grid_contents, get_text
+import log
+
+logger = log.get_logger(__name__)
+
+# Complete, ordered video enumeration for playlists and channel Videos
+# tabs that span more than one page. The first page comes from the HTML;
+# the rest is fetched from the browse endpoint until the continuation
+# tokens run out.
+# Everything is a generator, so downloads can start on the first page
+# while later pages are still being fetched.
+#
+# Videos are passed around as records:
+#   {'id': ..., 'url': ..., 'title': ..., 'index': ..., 'duration': ...}
+# where title, index and duration (in seconds) are None when unknown.
+
+TITLE_BATCH_SIZE = 8
+
+def parse_duration(text):
+    """Convert a length like '1:02:03' to seconds, or None"""
+    try:
+        seconds = 0
+        for part in text.split(':'):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except (AttributeError, ValueError):
+        return None
+
+def video_record(renderer, index=None):
+    """Build a video record from a playlist, panel or grid video renderer"""
+    video_id = renderer.get('videoId')
+    if not video_id:
+        return None
+    position = get_text(renderer.get('index') or renderer.get('indexText') or {})
+    if position.isdigit():
+        index = int(position)
+    if renderer.get('lengthSeconds'):
+        duration = int(renderer['lengthSeconds'])
+    else:
+        duration = parse_duration(get_text(renderer.get('lengthText', {})))
+    return {
+        'id': video_id,
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'title': get_text(renderer.get('title', {})) or None,
+        'index': index,
+        'duration': duration,
+    }
+
+def grid_video_record(item, index=None):
+    """Build a video record from a channel grid item (videoRenderer or lockupViewModel)"""
+    content = item.get('richItemRenderer', {}).get('content', {})
+    if 'videoRenderer' in content:
+        return video_record(content['videoRenderer'], index)
+    lockup = content.get('lockupViewModel')
+    if not lockup or lockup.get('contentType') != 'LOCKUP_CONTENT_TYPE_VIDEO' or not lockup.get('contentId'):
+        return None
+    video_id = lockup['contentId']
+    title = lockup.get('metadata', {}).get('lockupMetadataViewModel', {}).get('title', {}).get('content')
+    return {
+        'id': video_id,
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'title': title or None,
+        'index': index,
+        'duration': None,
+    }
+
+def as_record(video, index=None):
+    """Return a video record for a record or a bare watch URL"""
+    if isinstance(video, dict):
+        return video
+    video_id = video.split('watch?v=')[1].split('&')[0] if 'watch?v=' in video else None
+    return {'id': video_id, 'url': video, 'title': None, 'index': index, 'duration': None}
+
+def with_titles(videos, lookup, manifest=None, batch_size=TITLE_BATCH_SIZE):
+    """Pass records through, filling in missing titles with lookup(video_id).
+
+    Titled records go straight through. Untitled ones are held until
+    batch_size of them are waiting (or the input ends) and then looked
+    up together, so the oEmbed fallback costs one round trip per batch
+    rather than one per video. Order is preserved. With a manifest,
+    videos it lists as completed or without transcripts are left
+    untitled, since download_videos skips them without a request.
+    """
+    pending = []
+
+    def needs_title(video):
+        if video.get('title'):
+            return False
+        if manifest and video['id'] and (manifest.completed_path(video['id']) or manifest.is_unavailable(video['id'])):
+            return False
+        return True
+
+    def flush():
+        missing = [video for video, needed in pending if needed]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                for video, title in zip(missing, executor.map(lookup, [video['id'] for video in missing])):
+                    video['title'] = title
+        batch = [video for video, _ in pending]
+        pending.clear()
+        return batch
+
+    waiting = 0
+    for video in videos:
+        video = as_record(video)
+        needed = needs_title(video)
+        if not pending and not needed:
+            yield video
+            continue
+        pending.append((video, needed))
+        waiting += needed
+        if waiting >= batch_size:
+            waiting = 0
+            yield from flush()
+    if pending:
+        yield from flush()
+
+def iter_playlist_page_videos(page_content):
+    """Yield a record for every video of a playlist, given its first page.
+
+    Yields nothing when the page has no ytInitialData, so callers can
+    fall back to HTML parsing.
+    """
+    data = extract_initial_data(page_content)
+    if not data:
+        return
+
+    config = extract_client_config(page_content)
+    seen = set()
+    for item in iter_continuation_items(get_playlist_contents(data), config):
+        video = video_record(item.get('playlistVideoRenderer', {}), len(seen) + 1)
+        if video and video['id'] not in seen:
+            seen.add(video['id'])
+            yield video
+
+def iter_playlist_videos(playlist_id):
+    """Yield a record for every video of a playlist page by page"""
+    url = f"https://www.youtube.com/playlist?list={playlist_id}"
+    response = http_client.get(url)
+    if response.status_code != 200:
+        logger.error("Error accessing playlist: %s", response.status_code, extra={'status': response.status_code})
+        return
+    yield from iter_playlist_page_videos(response.content)
+
+def iter_channel_page_videos(page_content):
+    """Yield a record for every upload of a channel, given its Videos tab page.
+
+    The grid is followed through every continuation, newest upload first.
+    """
+    data = extract_initial_data(page_content)
+    if not data:
+        return
+
+    config = extract_client_config(page_content)
+    seen = set()
+    for item in iter_continuation_items(get_channel_grid_contents(data), config):
+        video = grid_video_record(item, len(seen) + 1)
+        if video and video['id'] not in seen:
+            seen.add(video['id'])
+            yield video
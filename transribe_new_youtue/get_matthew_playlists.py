@@ -1,9 +1,16 @@
 import requests
+import http_client
 from bs4 import BeautifulSoup
 import json
 import re
 import os
 import codecs
+import sys
+from yt_initial_data import extract_initial_data
+import log
+import debug_capture
+
+logger = log.get_logger(__name__)
 
 def ensure_valid_filename(filename):
     """Ensure the filename is valid and has correct extension"""
@@ -22,7 +29,7 @@ def save_file(content, filename, file_type='txt'):
         # Make filename safe
         valid_name = "".join(c if c.isalnum() or c in ' -_.' else '_' for c in filename).strip()
         
-        print(f"\nSaving to file: {valid_name}")
+        logger.debug("Saving to file: %s", valid_name)
         
         # For binary content (HTML, raw response)
         if isinstance(content, bytes):
@@ -42,7 +49,7 @@ def save_file(content, filename, file_type='txt'):
         return True
             
     except Exception as e:
-        print(f"Error saving file {filename}: {str(e)}")
+        logger.error("Error saving file %s: %s", filename, e)
         return False
 
 def read_file(filename):
@@ -57,18 +64,17 @@ def read_file(filename):
             with codecs.open(filename, 'r', encoding='utf-16') as f:
                 return f.read()
     except Exception as e:
-        print(f"Error reading file {filename}: {str(e)}")
+        logger.error("Error reading file %s: %s", filename, e)
         return None
 
 def get_playlists(channel_url):
     playlists = []
+    # Extra browser-like headers on top of the shared client defaults
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
         'Accept-Encoding': 'gzip, deflate, br',
         'DNT': '1',
-        'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
         'Sec-Fetch-Dest': 'document',
         'Sec-Fetch-Mode': 'navigate',
@@ -85,68 +91,54 @@ def get_playlists(channel_url):
     if not channel_url.endswith('/playlists'):
         channel_url = channel_url.rstrip('/') + '/playlists'
     
-    print(f"\nFetching playlists from: {channel_url}")
+    logger.info("Fetching playlists from: %s", channel_url)
     try:
-        response = requests.get(channel_url, headers=headers, cookies=cookies)
+        response = http_client.get(channel_url, headers=headers, cookies=cookies)
         response.raise_for_status()
         
-        # Save raw response bytes
-        save_file(response.content, "raw_response.txt")
-        
         # Convert content for processing
         content = response.content.decode('utf-8', errors='replace')
         
         if 'consent.youtube.com' in content:
-            print("\nGot consent page instead of channel page. Please visit the channel in your browser first.")
+            logger.warning("Got consent page instead of channel page. Please visit the channel in your browser first.")
+            debug_capture.capture('channel_playlists', response.content, "consent page", channel_url)
             return playlists
         
-        # Save HTML content
-        save_file(response.content, "youtube_channel.html")
-        
-        # Try to parse with BeautifulSoup first (using lxml parser)
-        print("\nParsing with BeautifulSoup...")
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Look for ytInitialData in script tags
-        for script in soup.find_all('script'):
-            if script.string and 'var ytInitialData = ' in script.string:
-                json_str = script.string.split('var ytInitialData = ')[1].split(';</script>')[0]
-                try:
-                    data = json.loads(json_str)
-                    save_file(data, "yt_data.json")
+        # Read ytInitialData straight from the response bytes
+        logger.debug("Looking for ytInitialData...")
+        data = extract_initial_data(response.content)
+        if data:
+            try:
+                # Look for playlists in tabs
+                tabs = data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])
+                for tab in tabs:
+                    if 'tabRenderer' in tab and tab['tabRenderer'].get('title') == 'Playlists':
+                        logger.debug("Found playlists tab")
+                        grid_items = tab['tabRenderer'].get('content', {}).get('sectionListRenderer', {}).get('contents', [{}])[0].get('itemSectionRenderer', {}).get('contents', [{}])[0].get('gridRenderer', {}).get('items', [])
                     
-                    # Look for playlists in tabs
-                    tabs = data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])
-                    for tab in tabs:
-                        if 'tabRenderer' in tab and tab['tabRenderer'].get('title') == 'Playlists':
-                            print("\nFound playlists tab")
-                            grid_items = tab['tabRenderer'].get('content', {}).get('sectionListRenderer', {}).get('contents', [{}])[0].get('itemSectionRenderer', {}).get('contents', [{}])[0].get('gridRenderer', {}).get('items', [])
+                        for item in grid_items:
+                            if 'gridPlaylistRenderer' in item:
+                                playlist_data = item['gridPlaylistRenderer']
+                                playlist_id = playlist_data.get('playlistId', '')
+                                title = ' '.join(t.get('text', '') for t in playlist_data.get('title', {}).get('runs', []))
+                                video_count = playlist_data.get('videoCount', {}).get('simpleText', '0 videos')
                             
-                            for item in grid_items:
-                                if 'gridPlaylistRenderer' in item:
-                                    playlist_data = item['gridPlaylistRenderer']
-                                    playlist_id = playlist_data.get('playlistId', '')
-                                    title = ' '.join(t.get('text', '') for t in playlist_data.get('title', {}).get('runs', []))
-                                    video_count = playlist_data.get('videoCount', {}).get('simpleText', '0 videos')
-                                    
-                                    if playlist_id and title:
-                                        playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
-                                        playlists.append({
-                                            'url': playlist_url,
-                                            'id': playlist_id,
-                                            'title': title,
-                                            'video_count': video_count
-                                        })
-                                        print(f"\nFound playlist: {title}")
-                                        print(f"Video count: {video_count}")
-                                        print(f"URL: {playlist_url}")
-                except Exception as e:
-                    print(f"Error parsing JSON from script tag: {str(e)}")
-                    continue
+                                if playlist_id and title:
+                                    playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
+                                    playlists.append({
+                                        'url': playlist_url,
+                                        'id': playlist_id,
+                                        'title': title,
+                                        'video_count': video_count
+                                    })
+                                    logger.debug("Found playlist: %s (%s videos) %s", title, video_count, playlist_url)
+            except Exception as e:
+                logger.error("Error parsing ytInitialData: %s", e)
         
         # If no playlists found, try direct HTML parsing
         if not playlists:
-            print("\nTrying direct HTML parsing...")
+            logger.info("Trying direct HTML parsing...")
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Look for playlist elements
             playlist_elements = soup.find_all(['ytd-grid-playlist-renderer', 'ytd-playlist-renderer'])
@@ -165,15 +157,14 @@ def get_playlists(channel_url):
                                 'id': playlist_id,
                                 'title': title
                             })
-                            print(f"\nFound playlist: {title}")
-                            print(f"URL: {playlist_url}")
+                            logger.debug("Found playlist: %s %s", title, playlist_url)
                 except Exception as e:
-                    print(f"Error processing playlist element: {str(e)}")
+                    logger.error("Error processing playlist element: %s", e)
                     continue
         
         # If still no playlists, try regex as last resort
         if not playlists:
-            print("\nTrying regex search...")
+            logger.info("Trying regex search...")
             playlist_matches = re.findall(r'href="(/playlist\?list=[^"]+)".*?title="([^"]+)"', content)
             for href, title in playlist_matches:
                 playlist_id = href.split('list=')[1].split('&')[0] if '&' in href else href.split('list=')[1]
@@ -184,23 +175,30 @@ def get_playlists(channel_url):
                         'id': playlist_id,
                         'title': title
                     })
-                    print(f"\nFound playlist: {title}")
-                    print(f"URL: {playlist_url}")
+                    logger.debug("Found playlist: %s %s", title, playlist_url)
+    
+        if playlists:
+            debug_capture.sample('channel_playlists', response.content, channel_url)
+        else:
+            debug_capture.capture('channel_playlists', response.content, "no playlists", channel_url)
     
     except requests.RequestException as e:
-        print(f"Error fetching channel: {str(e)}")
+        logger.error("Error fetching channel: %s", e)
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
     
-    print(f"\nFound {len(playlists)} playlists in total")
+    logger.info("Found %s playlists in total", len(playlists), extra={'count': len(playlists)})
     return playlists
 
 if __name__ == "__main__":
+    # Pass --debug-capture to keep the pages extraction fails on
+    if '--debug-capture' in sys.argv:
+        debug_capture.configure(enabled=True)
     channel_url = "https://www.youtube.com/@matthew_berman/playlists"
     playlists = get_playlists(channel_url)
     
     if playlists:
         save_file(playlists, "playlists.json")
-        print("\nSaved playlists to playlists.json")
+        logger.info("Saved playlists to playlists.json")
     else:
-        print("\nNo playlists were found to save") 
\ No newline at end of file
+        logger.warning("No playlists were found to save") 
\ No newline at end of file
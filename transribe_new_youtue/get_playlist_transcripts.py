@@ -1,10 +1,19 @@
-from youtube_transcript_api import YouTubeTranscriptApi
-import requests
-from bs4 import BeautifulSoup
+from transcript_selection import fetch_transcript, DEFAULT_POLICY
+import http_client
 import json
+from manifest import RunManifest
+from enumeration import iter_playlist_page_videos
 import os
-import time
 from urllib.parse import parse_qs, urlparse
+import log
+import output_writers
+
+logger = log.get_logger(__name__)
+
+TRACK_POLICY = DEFAULT_POLICY
+
+# Files written per video, by output_writers name; the first one is recorded in the manifest
+OUTPUT_FORMATS = ('lines',)
 
 def get_video_id(url):
     """Extract video ID from YouTube URL"""
@@ -16,7 +25,7 @@ def get_video_id(url):
             if 'v' in parse_qs(parsed_url.query):
                 return parse_qs(parsed_url.query)['v'][0]
     except Exception as e:
-        print(f"Error extracting video ID: {str(e)}")
+        logger.error("Error extracting video ID: %s", e)
     return None
 
 def get_safe_filename(title):
@@ -27,54 +36,21 @@ def get_playlist_videos(playlist_url):
     """Get all video URLs from a playlist"""
     videos = []
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
-        
-        print(f"\nFetching videos from playlist: {playlist_url}")
-        response = requests.get(playlist_url, headers=headers)
+        logger.info("Fetching videos from playlist: %s", playlist_url)
+        response = http_client.get(playlist_url)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for ytInitialData
-            for script in soup.find_all('script'):
-                if script.string and 'var ytInitialData = ' in script.string:
-                    data_text = script.string
-                    start_idx = data_text.find('var ytInitialData = ') + len('var ytInitialData = ')
-                    end_idx = data_text.find(';</script>', start_idx)
-                    
-                    if start_idx > 0 and end_idx > 0:
-                        try:
-                            data = json.loads(data_text[start_idx:end_idx])
-                            
-                            # Try to find playlist videos
-                            contents = data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])[0].get('tabRenderer', {}).get('content', {}).get('sectionListRenderer', {}).get('contents', [])[0].get('itemSectionRenderer', {}).get('contents', [])[0].get('playlistVideoListRenderer', {}).get('contents', [])
-                            
-                            if contents:
-                                for item in contents:
-                                    if 'playlistVideoRenderer' in item:
-                                        video_data = item['playlistVideoRenderer']
-                                        video_id = video_data.get('videoId')
-                                        title = ' '.join(t.get('text', '') for t in video_data.get('title', {}).get('runs', []))
-                                        
-                                        if video_id:
-                                            url = f"https://www.youtube.com/watch?v={video_id}"
-                                            videos.append({
-                                                'url': url,
-                                                'id': video_id,
-                                                'title': title
-                                            })
-                                            print(f"Found video: {title}")
-                        
-                        except json.JSONDecodeError as e:
-                            print(f"Error parsing JSON: {str(e)}")
-                            continue
+            # Read video records (with titles) from ytInitialData, all pages
+            for video in iter_playlist_page_videos(response.content):
+                video['title'] = video['title'] or f"Video_{video['id']}"
+                videos.append(video)
+                logger.debug("Found video: %s", video['title'])
             
             # If no videos found, try HTML parsing
             if not videos:
-                print("\nTrying HTML parsing method...")
+                logger.info("Trying HTML parsing method...")
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(response.content, 'html.parser')
                 for link in soup.find_all('a', href=True):
                     href = link['href']
                     if '/watch?v=' in href:
@@ -89,73 +65,32 @@ def get_playlist_videos(playlist_url):
                                 'id': video_id,
                                 'title': title
                             })
-                            print(f"Found video: {title}")
+                            logger.debug("Found video: %s", title)
     
     except Exception as e:
-        print(f"Error getting playlist videos: {str(e)}")
+        logger.error("Error getting playlist videos: %s", e)
     
-    print(f"\nFound {len(videos)} videos in playlist")
+    logger.info("Found %s videos in playlist", len(videos))
     return videos
 
-def get_transcript(video_id):
-    """Get transcript for a video"""
-    try:
-        # Try to get available transcripts
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        # First try: Manual English transcript
-        try:
-            transcript = transcript_list.find_transcript(['en'])
-            if not transcript.is_generated:
-                print("Using manual English transcript")
-                return transcript.fetch()
-        except:
-            pass
-        
-        # Second try: Auto-generated English transcript
-        try:
-            transcript = transcript_list.find_generated_transcript(['en'])
-            print("Using auto-generated English transcript")
-            return transcript.fetch()
-        except:
-            pass
-        
-        # Third try: Any manual transcript translated to English
-        try:
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                translated = transcript.translate('en')
-                print(f"Using translated transcript from {transcript.language_code} to English")
-                return translated.fetch()
-        except:
-            pass
-        
-        # Last try: Any available transcript
-        try:
-            available = list(transcript_list)
-            if available:
-                transcript = available[0]
-                print(f"Using transcript in {transcript.language_code}")
-                return transcript.fetch()
-        except:
-            pass
-        
-    except Exception as e:
-        print(f"Error getting transcript: {str(e)}")
-    return None
+def get_transcript(video_id, manifest=None):
+    """Get transcript for a video as (transcript, language_code)"""
+    return fetch_transcript(video_id, TRACK_POLICY, manifest)
 
-def process_playlists():
-    """Process all playlists from playlists.json"""
+def process_playlists(manifest=None):
+    """Process all playlists from playlists.json, skipping videos the manifest lists as done"""
     try:
+        if manifest is None:
+            manifest = RunManifest()
+        
         # Load playlists
         with open("playlists.json", "r", encoding="utf-8") as f:
             playlists = json.load(f)
         
-        print(f"\nFound {len(playlists)} playlists to process")
+        logger.info("Found %s playlists to process", len(playlists))
         
         for playlist in playlists:
-            print(f"\nProcessing playlist: {playlist['title']}")
+            logger.info("Processing playlist: %s", playlist['title'])
             
             # Create directory for playlist
             playlist_dir = get_safe_filename(playlist['title'])
@@ -167,29 +102,32 @@ def process_playlists():
             
             # Process each video
             for video in videos:
-                print(f"\nProcessing video: {video['title']}")
+                if manifest.is_completed(video['id'], playlist_dir, OUTPUT_FORMATS):
+                    logger.debug("Skipping already downloaded video: %s", video['title'])
+                    continue
+                if manifest.is_unavailable(video['id']):
+                    logger.debug("Skipping video without transcripts: %s", video['title'])
+                    continue
+                
+                logger.debug("Processing video: %s", video['title'])
                 
                 # Get transcript
-                transcript = get_transcript(video['id'])
+                transcript, language = get_transcript(video['id'], manifest)
                 if transcript:
                     # Save transcript
-                    filename = os.path.join(playlist_dir, f"{get_safe_filename(video['title'])}_transcript.txt")
-                    with open(filename, "w", encoding="utf-8") as f:
-                        for entry in transcript:
-                            f.write(f"{entry['text']}\n")
-                    print(f"Saved transcript to: {filename}")
+                    outputs = output_writers.write_transcript(transcript, os.path.join(playlist_dir, get_safe_filename(video['title'])), OUTPUT_FORMATS)
+                    manifest.mark_written(video['id'], language, outputs[0]['path'], outputs[0]['sha256'], sum(output['bytes'] for output in outputs))
+                    logger.debug("Saved transcript to: %s", ', '.join(output['path'] for output in outputs))
                 else:
-                    print("No transcript available")
-                
-                time.sleep(1)  # Delay to avoid rate limiting
+                    manifest.mark_failed(video['id'], "no transcript")
+                    logger.info("No transcript available")
             
-            print(f"\nCompleted playlist: {playlist['title']}")
-            time.sleep(2)  # Delay between playlists
+            logger.info("Completed playlist: %s", playlist['title'])
         
-        print("\nAll playlists processed!")
+        logger.info("All playlists processed!")
     
     except Exception as e:
-        print(f"Error processing playlists: {str(e)}")
+        logger.error("Error processing playlists: %s", e)
 
 if __name__ == "__main__":
     process_playlists() 
\ No newline at end of file
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# On-disk response cache sitting below http_client. Bodies are stored
+# zlib-compressed next to a small JSON metadata file; entries expire per
+# URL class and are then revalidated with ETag/Last-Modified. The
+# directory is kept under a size bound by evicting least recently used
+# entries.
+
+CACHE_DIR = ".http_cache"
+MAX_BYTES = 200 * 1024 * 1024
+
+# URL class -> seconds an entry is served without revalidation
+TTLS = {
+    'playlist': 3600,
+    'channel': 3600,
+    'browse': 3600,
+    'oembed': 30 * 24 * 3600,
+    'feed': 0,  # always revalidated; an unchanged feed costs a 304
+}
+
+# Response headers kept with each entry
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+def classify_url(method, url):
+    """Map a request to its cache class, or None if it should not be cached"""
+    if '/oembed' in url:
+        return 'oembed'
+    if '/youtubei/v1/browse' in url:
+        return 'browse'
+    if method != 'GET':
+        return None
+    if '/feeds/videos.xml' in url:
+        return 'feed'
+    if '/playlist?list=' in url:
+        return 'playlist'
+    if any(part in url for part in ('/@', '/channel/', '/c/', '/user/')):
+        return 'channel'
+    return None
+
+def cache_key(method, url, body=None):
+    """Stable key for a request; POST bodies are part of the key"""
+    raw = f"{method} {url}"
+    if body is not None:
+        raw += ' ' + json.dumps(body, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class HttpCache:
+    """Size-bounded LRU cache of HTTP responses on disk"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, ttls=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total = sum(os.path.getsize(path) for path in self._body_files())
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.z'
+
+    def _body_files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.z')]
+
+    def lookup(self, key):
+        """Return (meta, body) for a key, or None; marks the entry as recently used"""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = zlib.decompress(f.read())
+            os.utime(body_path)
+        except (OSError, ValueError, zlib.error):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta):
+        """Whether an entry is still inside its class TTL"""
+        ttl = self.ttls.get(meta.get('class'), 0)
+        return time.time() - meta.get('fetched_at', 0) < ttl
+
+    def conditional_headers(self, meta):
+        """Revalidation headers for a stale entry"""
+        headers = {}
+        if meta['headers'].get('ETag'):
+            headers['If-None-Match'] = meta['headers']['ETag']
+        if meta['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+        return headers
+
+    def _write_meta(self, meta_path, meta):
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def store(self, key, url_class, response):
+        """Save a 200 response"""
+        meta_path, body_path = self._paths(key)
+        compressed = zlib.compress(response.content, 6)
+        meta = {
+            'url': response.url,
+            'class': url_class,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'fetched_at': time.time(),
+        }
+        with self._lock:
+            old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            tmp_path = body_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, body_path)
+            self._write_meta(meta_path, meta)
+            self._total += len(compressed) - old_size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def refresh(self, key, meta):
+        """Restart an entry's TTL after a 304 Not Modified"""
+        meta_path, _ = self._paths(key)
+        meta['fetched_at'] = time.time()
+        with self._lock:
+            self._write_meta(meta_path, meta)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for path in self._body_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._total <= self.max_bytes:
+                break
+            for victim in (path, path[:-2] + '.json'):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+            self._total -= size
+
+    def build_response(self, meta, body):
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = meta['status']
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.url = meta['url']
+        response.encoding = meta.get('encoding') or 'utf-8'
+        response.from_cache = True
+        return response
+
+ENABLED = True
+_cache = None
+_lock = threading.Lock()
+
+def configure(enabled=None, directory=None, max_bytes=None):
+    """Turn the cache on/off or move it; takes effect on next use"""
+    global ENABLED, CACHE_DIR, MAX_BYTES, _cache
+    with _lock:
+        if enabled is not None:
+            ENABLED = enabled
+        if directory is not None:
+            CACHE_DIR = directory
+        if max_bytes is not None:
+            MAX_BYTES = max_bytes
+        _cache = None
+
+def get_cache():
+    """Return the shared cache, or None when caching is disabled"""
+    global _cache
+    if not ENABLED:
+        return None
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = HttpCache(CACHE_DIR, MAX_BYTES)
+    return _cache
@@ -0,0 +1,128 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+import rate_limiter
+import http_cache
+import metrics
+import profiling
+
+# Shared HTTP layer used by every script. One keep-alive session means one
+# TCP+TLS handshake per host instead of one per request.
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+DEFAULT_COOKIES = {
+    'CONSENT': 'YES+1',
+}
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+POOL_SIZE = 10
+MAX_RETRIES = 2  # extra attempts after a 429/5xx response
+
+_session = None
+_lock = threading.Lock()
+
+def _build_session():
+    """Create a session with pooled adapters, default headers and cookies"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    session.cookies.update(DEFAULT_COOKIES)
+    return session
+
+def configure(pool_size=None, connect_timeout=None, read_timeout=None):
+    """Change pool size and timeouts; the shared session is rebuilt on next use"""
+    global POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT, _session
+    with _lock:
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+        if read_timeout is not None:
+            READ_TIMEOUT = read_timeout
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def get_session():
+    """Return the process-wide session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def request(method, url, headers=None, cookies=None, timeout=None, **kwargs):
+    """Send a request through the shared session.
+
+    Per-call headers and cookies are merged over the defaults. Cacheable
+    requests are answered from the on-disk cache while fresh and
+    revalidated once stale. Network requests are paced by the rate
+    limiter for the URL's endpoint class and retried after throttling
+    responses.
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    cache = http_cache.get_cache()
+    url_class = http_cache.classify_url(method, url) if cache else None
+    entry = None
+    if url_class:
+        key = http_cache.cache_key(method, url, kwargs.get('json'))
+        entry = cache.lookup(key)
+        if entry:
+            meta, body = entry
+            if cache.is_fresh(meta):
+                metrics.inc('http_cache_total', result='hit')
+                return cache.build_response(meta, body)
+            headers = dict(headers or {}, **cache.conditional_headers(meta))
+
+    endpoint = rate_limiter.classify_url(url)
+    # metrics use the finer cache classes (playlist, channel, browse, ...) where they apply
+    label = http_cache.classify_url(method, url) or endpoint
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limiter.acquire(endpoint)
+        started = time.perf_counter()
+        with profiling.span(f"fetch:{label}"):
+            response = get_session().request(method, url, headers=headers, cookies=cookies, timeout=timeout, **kwargs)
+        metrics.observe('http_request_seconds', time.perf_counter() - started, endpoint=label)
+        metrics.inc('http_requests_total', endpoint=label, status=str(response.status_code))
+        metrics.inc('http_response_bytes_total', len(response.content), endpoint=label)
+        rate_limiter.report(endpoint, response.status_code, response.headers.get('Retry-After'))
+        if not rate_limiter.is_throttled(response.status_code):
+            break
+        metrics.inc('http_throttled_total', endpoint=label)
+
+    if url_class:
+        if response.status_code == 304 and entry:
+            metrics.inc('http_cache_total', result='revalidated')
+            cache.refresh(key, meta)
+            return cache.build_response(meta, body)
+        metrics.inc('http_cache_total', result='miss')
+        if response.status_code == 200:
+            cache.store(key, url_class, response)
+    return response
+
+def get(url, **kwargs):
+    """GET a URL through the shared session"""
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    """POST to a URL through the shared session"""
+    return request('POST', url, **kwargs)
+
+def close():
+    """Close all pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,87 @@
+import re
+import http_client
+import log
+
+logger = log.get_logger(__name__)
+
+# Minimal client for YouTube's internal browse endpoint, used to follow
+# continuation tokens past the first page of a playlist or channel tab.
+
+BROWSE_URL = "https://www.youtube.com/youtubei/v1/browse"
+DEFAULT_CLIENT_VERSION = '2.20250213.05.00'
+
+_API_KEY_RE = re.compile(rb'"INNERTUBE_API_KEY":"([^"]+)"')
+_CLIENT_VERSION_RE = re.compile(rb'"INNERTUBE_CLIENT_VERSION":"([^"]+)"')
+
+def extract_client_config(content):
+    """Read the API key and client version from a page's ytcfg"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    api_key = _API_KEY_RE.search(content)
+    client_version = _CLIENT_VERSION_RE.search(content)
+    return {
+        'api_key': api_key.group(1).decode() if api_key else None,
+        'client_version': client_version.group(1).decode() if client_version else DEFAULT_CLIENT_VERSION,
+    }
+
+def browse_continuation(token, config):
+    """Fetch one continuation page from the browse endpoint, or None on failure"""
+    url = BROWSE_URL + "?prettyPrint=false"
+    if config.get('api_key'):
+        url += f"&key={config['api_key']}"
+    body = {
+        'context': {
+            'client': {
+                'clientName': 'WEB',
+                'clientVersion': config.get('client_version', DEFAULT_CLIENT_VERSION),
+                'hl': 'en',
+            }
+        },
+        'continuation': token,
+    }
+    try:
+        response = http_client.post(url, json=body)
+        if response.status_code == 200:
+            return response.json()
+        logger.warning("Continuation request failed: %s", response.status_code, extra={'status': response.status_code})
+    except Exception as e:
+        logger.error("Error fetching continuation: %s", e)
+    return None
+
+def get_continuation_token(item):
+    """Return the token of a continuationItemRenderer, or None"""
+    endpoint = item.get('continuationItemRenderer', {}).get('continuationEndpoint', {})
+    token = endpoint.get('continuationCommand', {}).get('token')
+    if token:
+        return token
+    # Newer layouts wrap the command in a commandExecutorCommand
+    for command in endpoint.get('commandExecutorCommand', {}).get('commands', []):
+        token = command.get('continuationCommand', {}).get('token')
+        if token:
+            return token
+    return None
+
+def get_continuation_items(data):
+    """Return the items carried by a browse continuation response"""
+    actions = data.get('onResponseReceivedActions', []) + data.get('onResponseReceivedEndpoints', [])
+    for action in actions:
+        for key in ('appendContinuationItemsAction', 'reloadContinuationItemsCommand'):
+            if key in action:
+                return action[key].get('continuationItems', [])
+    return []
+
+def iter_continuation_items(items, config):
+    """Yield the items of a first page and of every continuation page after it"""
+    while items:
+        token = None
+        for item in items:
+            if 'continuationItemRenderer' in item:
+                token = get_continuation_token(item)
+            else:
+                yield item
+        if not token:
+            break
+        data = browse_continuation(token, config)
+        if not data:
+            break
+        items = get_continuation_items(data)
@@ -0,0 +1,66 @@
+import json
+import logging
+import sys
+
+# Leveled logging shared by every script, on top of the standard logging
+# module. Per-video and per-link detail is logged at DEBUG, so a default
+# run only shows per-stage summaries, warnings and errors. Output goes to
+# stderr, either as plain text or as one JSON object per line.
+#
+#   logger = log.get_logger(__name__)
+#   logger.info("Found %d videos", count, extra={'count': count})
+#
+# Values passed through extra= become fields of the JSON records.
+# Interactive prompts and menus are not log output and remain plain prints.
+
+ROOT = "transcripts"
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single JSON line"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage().strip(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def get_logger(name):
+    """Return the logger of a module, under the shared root logger"""
+    if name == '__main__':
+        name = sys.argv[0].rsplit('/', 1)[-1].rsplit('.', 1)[0] or 'main'
+    return logging.getLogger(f"{ROOT}.{name}")
+
+def configure(level='info', json_mode=False, stream=None):
+    """Set the level and output format of all script logging.
+
+    level is a name from LEVELS or a logging level number; json_mode
+    switches from plain messages to JSON lines.
+    """
+    root = logging.getLogger(ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if json_mode else logging.Formatter("%(message)s"))
+    root.addHandler(handler)
+    root.setLevel(LEVELS.get(level, level) if isinstance(level, str) else level)
+    root.propagate = False
+
+# Plain INFO output until a script or the CLI calls configure()
+configure()
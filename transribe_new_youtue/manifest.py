@@ -0,0 +1,206 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import metrics
+import output_writers
+
+# Persistent record of every video a run has touched, so reruns skip
+# finished transcripts and only retry failures. Also remembers which
+# caption track was chosen for each video, which videos have no
+# captions at all so reruns skip them until the entry expires, and the
+# resolved id of each channel URL.
+
+DEFAULT_PATH = "transcripts_manifest.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    language TEXT,
+    output_path TEXT,
+    content_hash TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS track_choices (
+    video_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    language TEXT NOT NULL,
+    translate_to TEXT,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS unavailable (
+    video_id TEXT PRIMARY KEY,
+    reason TEXT,
+    checked_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS channels (
+    url TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Seconds a video without captions is skipped before it is checked again
+UNAVAILABLE_TTL = 7 * 24 * 3600
+
+class RunManifest:
+    """SQLite-backed manifest keyed by video id; safe to share between threads"""
+
+    def __init__(self, path=DEFAULT_PATH, unavailable_ttl=UNAVAILABLE_TTL):
+        self.path = path
+        self.unavailable_ttl = unavailable_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def get(self, video_id):
+        """Return the manifest row for a video as a dict, or None"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM videos WHERE video_id = ?", (video_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([c[0] for c in cursor.description], row))
+
+    def completed_path(self, video_id):
+        """Return where the video's transcript was saved, if it was downloaded and the file still exists"""
+        entry = self.get(video_id)
+        if entry and entry['status'] == 'completed' and entry['output_path'] and os.path.exists(entry['output_path']):
+            return entry['output_path']
+        return None
+
+    def is_completed(self, video_id, output_dir=None, formats=None):
+        """Whether the video was downloaded and its output file still exists, in output_dir if given.
+
+        With formats (output_writers names), every one of them must have
+        been saved next to it as well.
+        """
+        path = self.completed_path(video_id)
+        if path is None:
+            return False
+        if output_dir is not None and os.path.realpath(os.path.dirname(os.path.abspath(path))) != os.path.realpath(output_dir):
+            return False
+        return not output_writers.missing_formats(output_writers.transcript_base(path), formats)
+
+    def _upsert(self, video_id, status, language=None, output_path=None, content_hash=None, error=None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO videos (video_id, status, language, output_path, content_hash, attempts, error, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    status = excluded.status,
+                    language = COALESCE(excluded.language, videos.language),
+                    output_path = COALESCE(excluded.output_path, videos.output_path),
+                    content_hash = COALESCE(excluded.content_hash, videos.content_hash),
+                    attempts = videos.attempts + 1,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (video_id, status, language, output_path, content_hash, error, now, now),
+            )
+
+    def mark_completed(self, video_id, language, output_path, content):
+        """Record a saved transcript along with a hash of its content"""
+        data = content.encode('utf-8')
+        self.mark_written(video_id, language, output_path, hashlib.sha256(data).hexdigest(), len(data))
+
+    def mark_written(self, video_id, language, output_path, content_hash, size):
+        """Record a transcript that was streamed to disk, given the hash of its main file and the bytes written"""
+        self._upsert(video_id, 'completed', language, output_path, content_hash)
+        metrics.inc('transcripts_written_total')
+        metrics.inc('transcript_bytes_written_total', size)
+
+    def mark_failed(self, video_id, error=None):
+        """Record a failed attempt so the next run retries it"""
+        self._upsert(video_id, 'failed', error=error)
+        # missing transcripts are counted by transcript_selection with their cause
+        if error != 'no transcript':
+            metrics.inc('failures_total', reason='error')
+
+    def get_track_choice(self, video_id):
+        """Return the caption track picked for a video on an earlier run, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, language, translate_to FROM track_choices WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'kind': row[0], 'language': row[1], 'translate_to': row[2]}
+
+    def record_track_choice(self, video_id, kind, language, translate_to=None):
+        """Remember which caption track was used so reruns can ask for it directly"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO track_choices (video_id, kind, language, translate_to, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, kind, language, translate_to, time.time()),
+            )
+
+    def is_unavailable(self, video_id):
+        """Whether the video was recently found to have no transcripts at all"""
+        with self._lock:
+            row = self._conn.execute("SELECT checked_at FROM unavailable WHERE video_id = ?", (video_id,)).fetchone()
+        return bool(row and time.time() - row[0] < self.unavailable_ttl)
+
+    def mark_unavailable(self, video_id, reason=None):
+        """Remember that a video has transcripts disabled or none to offer"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO unavailable (video_id, reason, checked_at) VALUES (?, ?, ?)",
+                (video_id, reason, time.time()),
+            )
+
+    def clear_unavailable(self, video_id=None):
+        """Forget cached unavailable videos (all of them when no id is given)"""
+        with self._lock, self._conn:
+            if video_id is None:
+                self._conn.execute("DELETE FROM unavailable")
+            else:
+                self._conn.execute("DELETE FROM unavailable WHERE video_id = ?", (video_id,))
+
+    def is_seen(self, video_id):
+        """Whether a run has already come across the video, whatever the outcome"""
+        if self.is_unavailable(video_id):
+            return True
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        return row is not None
+
+    def is_known(self, video_id):
+        """Whether the video needs no further attempt: completed, or recently found to have no transcripts.
+
+        Failed videos are not known, so they are offered again.
+        """
+        if self.is_unavailable(video_id):
+            return True
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM videos WHERE video_id = ? AND status = 'completed'", (video_id,)).fetchone()
+        return row is not None
+
+    def get_channel_id(self, url):
+        """Return the channel id resolved for a channel URL on an earlier run, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT channel_id FROM channels WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def record_channel_id(self, url, channel_id):
+        """Remember the channel id of a channel URL so syncs skip the channel page"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channels (url, channel_id, updated_at) VALUES (?, ?, ?)",
+                (url, channel_id, time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,162 @@
+import bisect
+import json
+import threading
+import time
+
+# In-process metrics for a run: counters and latency histograms keyed by
+# name and labels. http_client, the transcript rate limiter and the
+# manifest feed it; the totals can be scraped in Prometheus text format
+# from a local HTTP endpoint while the run is going, and dumped as JSON
+# at the end.
+#
+#   metrics.inc('http_requests_total', endpoint='playlist', status='200')
+#   metrics.observe('http_request_seconds', 0.42, endpoint='playlist')
+
+PREFIX = "yt_transcripts_"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    'http_requests_total': "HTTP requests sent, by endpoint class and status",
+    'http_request_seconds': "Request latency by endpoint class, including transcript API calls",
+    'http_throttled_total': "Throttling responses (429/5xx or API blocks) by endpoint class",
+    'http_response_bytes_total': "Response body bytes downloaded, by endpoint class",
+    'http_cache_total': "On-disk cache lookups by result (hit, revalidated, miss)",
+    'transcripts_written_total': "Transcripts saved",
+    'transcript_bytes_written_total': "Transcript bytes written to disk",
+    'failures_total': "Videos that ended without a transcript, by reason",
+    'videos_skipped_total': "Videos skipped without a request, by reason",
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_started = time.time()
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def inc(name, value=1, **labels):
+    """Add value to a counter"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+    """Record one observation, in seconds, in a latency histogram"""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+        histogram['buckets'][bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+def reset():
+    """Forget every recorded value and restart the run clock"""
+    global _started
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _started = time.time()
+
+def _total(name, **match):
+    return sum(value for (key, labels), value in _counters.items()
+               if key == name and all(dict(labels).get(k) == v for k, v in match.items()))
+
+def snapshot():
+    """Return all metrics plus derived rates as a JSON-ready dict"""
+    with _lock:
+        elapsed = time.time() - _started
+        counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(_counters.items())]
+        histograms = [{'name': name, 'labels': dict(labels), 'count': h['count'], 'sum': round(h['sum'], 6),
+                       'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], h['buckets']))}
+                      for (name, labels), h in sorted(_histograms.items())]
+        written = _total('transcripts_written_total')
+        hits = _total('http_cache_total', result='hit') + _total('http_cache_total', result='revalidated')
+        lookups = _total('http_cache_total')
+    return {
+        'elapsed_seconds': round(elapsed, 3),
+        'transcripts_per_second': round(written / elapsed, 4) if elapsed else 0.0,
+        'cache_hit_ratio': round(hits / lookups, 4) if lookups else None,
+        'counters': counters,
+        'histograms': histograms,
+    }
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels, extra=None):
+    items = list(labels) + list(extra or [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+def render_prometheus():
+    """Return all metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, dict(h, buckets=list(h['buckets']))) for key, h in _histograms.items())
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            if name in HELP:
+                lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+        lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+    for (name, labels), h in histograms:
+        if name not in seen:
+            seen.add(name)
+            if name in HELP:
+                lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+        cumulative = 0
+        for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], h['buckets']):
+            cumulative += count
+            lines.append(f"{PREFIX}{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {h['sum']:.6f}")
+        lines.append(f"{PREFIX}{name}_count{_labels(labels)} {h['count']}")
+    derived = snapshot()
+    lines.append(f"# TYPE {PREFIX}transcripts_per_second gauge")
+    lines.append(f"{PREFIX}transcripts_per_second {derived['transcripts_per_second']}")
+    if derived['cache_hit_ratio'] is not None:
+        lines.append(f"# TYPE {PREFIX}cache_hit_ratio gauge")
+        lines.append(f"{PREFIX}cache_hit_ratio {derived['cache_hit_ratio']}")
+    return '\n'.join(lines) + '\n'
+
+def serve(port, host='127.0.0.1'):
+    """Serve render_prometheus() at /metrics from a background thread and return the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def dump(path):
+    """Write snapshot() as JSON to a file, or to stdout when path is '-'"""
+    data = json.dumps(snapshot(), indent=2)
+    if path == '-':
+        print(data)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(data + '\n')
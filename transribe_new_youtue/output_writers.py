@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import ExitStack
+from transcript_segments import TranscriptSegments
+import profiling
+
+# Output formats for saved transcripts. Each format is a writer class that
+# streams segments into an open file, so no format builds the whole output
+# in memory first. write_transcript() opens one file per selected format
+# and feeds every writer from the same pass over the segments, so a
+# transcript is fetched once however many formats are wanted.
+#
+#   outputs = write_transcript(segments, os.path.join(output_dir, safe_title), ('text', 'srt'))
+#   outputs[0]['path'], outputs[0]['sha256']
+#
+# Writers receive the segments in TranscriptSegments chunks of CHUNK_SIZE;
+# what they produce for a chunk is written out before the next one, and
+# the two halves are reported to profiling as the 'format' and
+# 'file_write' stages.
+#
+# A new format only has to implement write_segment(); it is then picked by
+# name once added with register().
+
+CHUNK_SIZE = 1000
+_LINESEP = os.linesep.encode('ascii')
+
+class TranscriptWriter:
+    """Base class: writes segments to a text stream"""
+
+    NAME = None
+    EXTENSION = '.txt'
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def begin(self):
+        pass
+
+    def write_chunk(self, chunk):
+        for text, start, duration in zip(chunk.texts(), chunk.starts, chunk.durations):
+            self.write_segment(text, start, duration)
+            self.count += 1
+
+    def write_segment(self, text, start, duration):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+class PlainTextWriter(TranscriptWriter):
+    """One line of text per segment, no timestamps"""
+
+    NAME = 'text'
+
+    def write_chunk(self, chunk):
+        if len(chunk):
+            self.stream.write(('\n' if self.count else '') + chunk.plain_text())
+            self.count += len(chunk)
+
+class LineTextWriter(TranscriptWriter):
+    """Like text, but every segment ends with a newline, including the last"""
+
+    NAME = 'lines'
+
+    def write_chunk(self, chunk):
+        if len(chunk):
+            self.stream.write(chunk.plain_text() + '\n')
+            self.count += len(chunk)
+
+class TimestampedTextWriter(TranscriptWriter):
+    """Text lines prefixed with [MM:SS] timestamps"""
+
+    NAME = 'timestamped'
+
+    def write_chunk(self, chunk):
+        if len(chunk):
+            self.stream.write(('\n' if self.count else '') + chunk.format_timestamped())
+            self.count += len(chunk)
+
+class JsonLinesWriter(TranscriptWriter):
+    """One {"text", "start", "duration"} object per line"""
+
+    NAME = 'jsonl'
+    EXTENSION = '.jsonl'
+
+    def write_segment(self, text, start, duration):
+        self.stream.write(json.dumps({'text': text, 'start': start, 'duration': duration}, ensure_ascii=False) + '\n')
+
+def _clock(seconds, separator):
+    """HH:MM:SS<separator>mmm cue time"""
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+class SrtWriter(TranscriptWriter):
+    """SubRip subtitles"""
+
+    NAME = 'srt'
+    EXTENSION = '.srt'
+
+    def write_segment(self, text, start, duration):
+        self.stream.write(f"{self.count + 1}\n{_clock(start, ',')} --> {_clock(start + duration, ',')}\n{text}\n\n")
+
+class WebVttWriter(TranscriptWriter):
+    """WebVTT subtitles"""
+
+    NAME = 'vtt'
+    EXTENSION = '.vtt'
+
+    def begin(self):
+        self.stream.write("WEBVTT\n\n")
+
+    def write_segment(self, text, start, duration):
+        # cue text may not contain raw '&' or '<'
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        self.stream.write(f"{_clock(start, '.')} --> {_clock(start + duration, '.')}\n{text}\n\n")
+
+WRITERS = {}
+
+def register(writer_class):
+    """Make a writer selectable by its NAME"""
+    WRITERS[writer_class.NAME] = writer_class
+    return writer_class
+
+for _writer in (PlainTextWriter, LineTextWriter, TimestampedTextWriter, JsonLinesWriter, SrtWriter, WebVttWriter):
+    register(_writer)
+
+def parse_formats(text):
+    """Turn a comma-separated format list into a tuple of names, rejecting unknown ones"""
+    formats = tuple(dict.fromkeys(name.strip().lower() for name in text.split(',') if name.strip()))
+    if not formats:
+        raise ValueError("no output format given")
+    for name in formats:
+        if name not in WRITERS:
+            raise ValueError(f"unknown output format '{name}' (choose from {', '.join(WRITERS)})")
+    return formats
+
+def output_paths(base, formats):
+    """Return {format: path} for the files a transcript is saved to.
+
+    The first format with a given extension gets base + "_transcript" + ext;
+    later ones sharing that extension are told apart by their name,
+    e.g. base + "_transcript.timestamped.txt".
+    """
+    paths = {}
+    taken = set()
+    for name in formats:
+        extension = WRITERS[name].EXTENSION
+        paths[name] = f"{base}_transcript{extension}" if extension not in taken else f"{base}_transcript.{name}{extension}"
+        taken.add(extension)
+    return paths
+
+def transcript_base(path):
+    """Recover the base passed to output_paths() from one of its paths"""
+    return path.rpartition('_transcript')[0]
+
+def saved_base(path, directory):
+    """The base, in directory, of a transcript saved at path (here or elsewhere)"""
+    return os.path.join(directory, os.path.basename(transcript_base(path)))
+
+def missing_formats(base, formats):
+    """Return the formats that have no file under base yet; a .ref link counts as a file"""
+    paths = output_paths(base, formats or ())
+    return tuple(name for name in formats or () if not (os.path.exists(paths[name]) or os.path.exists(paths[name] + '.ref')))
+
+def load_segments(base):
+    """Read a transcript back from its saved JSONL file, or return None when there is none"""
+    path = output_paths(base, ('jsonl',))['jsonl']
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return TranscriptSegments.from_entries(json.loads(line) for line in f if line.strip())
+
+def saved_outputs(path):
+    """Return every format saved alongside the transcript file at path"""
+    directory, prefix = os.path.split(transcript_base(path) + '_transcript')
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory or '.'))
+            if name.startswith(prefix + '.') and not name.endswith('.ref')]
+
+def link_transcript(source_path, directory):
+    """Give a directory its own entry for a transcript saved elsewhere.
+
+    Uses a hardlink where the filesystem allows it, otherwise a small
+    .ref file holding the relative path of the original.
+    """
+    target = os.path.join(directory, os.path.basename(source_path))
+    if os.path.exists(target):
+        return target
+    try:
+        os.link(source_path, target)
+    except OSError:
+        target += '.ref'
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(os.path.relpath(source_path, directory) + '\n')
+    return target
+
+def link_outputs(path, directory):
+    """Link the transcript at path, in every format it was saved in, into directory"""
+    return [link_transcript(source, directory) for source in saved_outputs(path)]
+
+class _HashingFile:
+    """Collects a writer's text and, on flush(), encodes it to a binary file, hashing and counting it.
+
+    Newlines are written as os.linesep, as a text-mode file would; the
+    hash and byte count are of the text with plain '\\n' newlines.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.sha256()
+        self.bytes = 0
+        self.pending = []
+
+    def write(self, text):
+        self.pending.append(text)
+
+    def flush(self):
+        data = ''.join(self.pending).encode('utf-8')
+        self.pending.clear()
+        self.hash.update(data)
+        self.bytes += len(data)
+        self.raw.write(data if _LINESEP == b'\n' else data.replace(b'\n', _LINESEP))
+
+def _format_steps(writers, segments):
+    """Run the writers over the segments, pausing after each chunk so its output can be written"""
+    for writer in writers:
+        writer.begin()
+    yield
+    for first in range(0, len(segments), CHUNK_SIZE):
+        chunk = segments[first:first + CHUNK_SIZE]
+        for writer in writers:
+            writer.write_chunk(chunk)
+        yield
+    for writer in writers:
+        writer.end()
+    yield
+
+def write_transcript(segments, base, formats, only=None):
+    """Save segments in every format in one pass.
+
+    File names follow output_paths(base, formats); pass only to write just
+    some of those formats, e.g. the ones missing_formats() reports.
+    Returns one {'format', 'path', 'sha256', 'bytes'} dict per written
+    format, in the order the formats were given.
+    """
+    segments = TranscriptSegments.from_entries(segments)
+    paths = output_paths(base, formats)
+    if only is not None:
+        formats = tuple(name for name in formats if name in only)
+    format_seconds = 0.0
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        streams = [_HashingFile(stack.enter_context(open(paths[name], 'wb'))) for name in formats]
+        writers = [WRITERS[name](stream) for name, stream in zip(formats, streams)]
+        mark = time.perf_counter()
+        for _ in _format_steps(writers, segments):
+            format_seconds += time.perf_counter() - mark
+            for stream in streams:
+                stream.flush()
+            mark = time.perf_counter()
+    if profiling.ENABLED:
+        profiling.record('format', format_seconds)
+        profiling.record('file_write', time.perf_counter() - started - format_seconds)
+    return [{'format': name, 'path': paths[name], 'sha256': stream.hash.hexdigest(), 'bytes': stream.bytes}
+            for name, stream in zip(formats, streams)]
@@ -0,0 +1,164 @@
+import re
+import time
+import http_client
+from innertube import extract_client_config, iter_continuation_items
+from yt_initial_data import extract_initial_data, get_text
+import log
+import profiling
+
+logger = log.get_logger(__name__)
+
+# Lists every playlist of a channel over plain HTTP: the first grid comes
+# from the channel's /playlists page, the rest from browse continuations.
+# Handles the current lockupViewModel layout as well as the older
+# gridPlaylistRenderer/playlistRenderer ones. The Selenium scroll loop
+# is kept at the bottom as an explicit fallback.
+
+PLAYLIST_KEYS = ('lockupViewModel', 'gridPlaylistRenderer', 'playlistRenderer')
+
+def playlists_url(channel_url):
+    """Return the /playlists tab URL of a channel"""
+    channel_url = channel_url.split('?')[0].rstrip('/')
+    if not channel_url.endswith('/playlists'):
+        channel_url += '/playlists'
+    return channel_url
+
+def playlist_record(item):
+    """Build {'id', 'url', 'title'} from a playlist grid item, or None"""
+    if 'lockupViewModel' in item:
+        lockup = item['lockupViewModel']
+        if lockup.get('contentType') != 'LOCKUP_CONTENT_TYPE_PLAYLIST':
+            return None
+        playlist_id = lockup.get('contentId')
+        title = lockup.get('metadata', {}).get('lockupMetadataViewModel', {}).get('title', {}).get('content', '')
+    else:
+        renderer = item.get('gridPlaylistRenderer') or item.get('playlistRenderer')
+        if not renderer:
+            return None
+        playlist_id = renderer.get('playlistId')
+        title = get_text(renderer.get('title', {}))
+    if not playlist_id:
+        return None
+    return {
+        'id': playlist_id,
+        'url': f"https://www.youtube.com/playlist?list={playlist_id}",
+        'title': title or f"Playlist_{playlist_id}",
+    }
+
+def find_playlist_grids(obj):
+    """Yield every list in ytInitialData that holds playlist items"""
+    if isinstance(obj, dict):
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                yield from find_playlist_grids(value)
+    elif isinstance(obj, list):
+        if any(isinstance(item, dict) and any(key in item for key in PLAYLIST_KEYS) for item in obj):
+            yield obj
+            return
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                yield from find_playlist_grids(item)
+
+def iter_page_playlists(page_content, data=None):
+    """Yield a record for every playlist of a channel, given its /playlists page
+    (and its ytInitialData, when the caller already parsed it)"""
+    data = data or extract_initial_data(page_content)
+    if not data:
+        return
+
+    config = extract_client_config(page_content)
+    seen = set()
+    for grid in find_playlist_grids(data):
+        for item in iter_continuation_items(grid, config):
+            playlist = playlist_record(item)
+            if playlist and playlist['id'] not in seen:
+                seen.add(playlist['id'])
+                yield playlist
+
+def iter_channel_playlists(channel_url):
+    """Yield a record for every playlist of a channel, page by page"""
+    url = playlists_url(channel_url)
+    response = http_client.get(url)
+    if response.status_code != 200:
+        logger.error("Error accessing channel: %s", response.status_code, extra={'status': response.status_code})
+        return
+    yield from iter_page_playlists(response.content)
+
+def get_channel_playlists(channel_url):
+    """Return every playlist of a channel as a list of records"""
+    return list(iter_channel_playlists(channel_url))
+
+#########################################
+# Fallback: Selenium scroll loop
+#########################################
+
+def scroll_down(driver, pause_time=2):
+    """Scrolls down the page until no new content is loaded."""
+    last_height = driver.execute_script("return document.documentElement.scrollHeight")
+    while True:
+        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+        time.sleep(pause_time)
+        new_height = driver.execute_script("return document.documentElement.scrollHeight")
+        if new_height == last_height:
+            break
+        last_height = new_height
+
+def get_playlist_links_selenium(channel_url):
+    """
+    Uses Selenium to load the full channel playlists page and extracts all playlist URLs.
+    Slow (a headless Chrome plus fixed scroll pauses); only used when asked for.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from bs4 import BeautifulSoup
+
+    # Set up headless Chrome
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+
+    driver = webdriver.Chrome(options=options)
+    driver.get(channel_url)
+
+    # Allow initial content to load
+    time.sleep(3)
+    # Scroll to fully load the page
+    scroll_down(driver, pause_time=2)
+
+    # Get the fully loaded page source
+    html = driver.page_source
+    driver.quit()
+
+    # Parse the page source with BeautifulSoup
+    with profiling.span('bs4_parse'):
+        soup = BeautifulSoup(html, "html.parser")
+    links = soup.find_all("a", href=True)
+
+    playlist_links = set()
+    # Look for links that include both "/watch?v=" and "list="
+    for link in links:
+        href = link["href"]
+        if "/watch?v=" in href and "list=" in href:
+            match = re.search(r"list=([\w-]+)", href)
+            if match:
+                playlist_id = match.group(1)
+                playlist_links.add(f"https://www.youtube.com/playlist?list={playlist_id}")
+
+    return list(playlist_links)
+
+def get_playlist_links(channel_url, selenium_fallback=False):
+    """
+    Returns the playlist URLs of a channel using plain HTTP requests.
+    Falls back to the Selenium scroll loop only when selenium_fallback is set
+    and the HTTP path found nothing.
+    """
+    links = []
+    try:
+        links = [playlist['url'] for playlist in iter_channel_playlists(channel_url)]
+    except Exception as e:
+        logger.error("Error listing playlists over HTTP: %s", e)
+    if not links and selenium_fallback:
+        logger.warning("No playlists found over HTTP; falling back to Selenium...")
+        links = get_playlist_links_selenium(playlists_url(channel_url))
+    return links
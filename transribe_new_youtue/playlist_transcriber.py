@@ -1,11 +1,23 @@
-from youtube_transcript_api import YouTubeTranscriptApi
+from transcript_selection import fetch_transcript, DEFAULT_POLICY
 import re
 from urllib.parse import urlparse, parse_qs
-import requests
+import http_client
 import os
-import time
-from bs4 import BeautifulSoup
-import json
+from yt_initial_data import extract_initial_data, get_playlist_video_renderers, get_playlist_header
+from enumeration import iter_playlist_page_videos, as_record, with_titles
+from download_engine import download_videos, DEFAULT_WORKERS
+from manifest import RunManifest
+import log
+import debug_capture
+import profiling
+import output_writers
+
+logger = log.get_logger(__name__)
+
+TRACK_POLICY = DEFAULT_POLICY
+
+# Files written per video, by output_writers name; the first one is recorded in the manifest
+OUTPUT_FORMATS = ('text',)
 
 def get_playlist_id(url):
     """Extract playlist ID from YouTube URL"""
@@ -14,145 +26,150 @@ def get_playlist_id(url):
         if 'list=' in url:
             return parse_qs(parsed_url.query)['list'][0]
     except Exception as e:
-        print(f"Error extracting playlist ID: {str(e)}")
+        logger.error("Error extracting playlist ID: %s", e)
     return None
 
-def analyze_html_response(html_content):
+def analyze_html_response(html_content, url=None):
     """Analyze HTML content for video links and playlist data"""
-    print("\nAnalyzing HTML response...")
-    soup = BeautifulSoup(html_content, 'html.parser')
-    video_links = []
+    logger.debug("Analyzing HTML response...")
+    video_links = {}  # insertion-ordered set of URLs
+    
+    # Fast path: read video IDs straight from ytInitialData
+    logger.debug("Looking for ytInitialData...")
+    data = extract_initial_data(html_content)
+    if data:
+        for renderer in get_playlist_video_renderers(data):
+            video_id = renderer.get('videoId')
+            if video_id:
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found video from ytInitialData: %s", video_url)
+    
+    # Fall back to parsing the HTML only when the blob is missing
+    if not video_links:
+        logger.debug("Trying fallback methods...")
+        from bs4 import BeautifulSoup
+        with profiling.span('bs4_parse'):
+            soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # First try: Direct link extraction from thumbnails
+        logger.debug("Looking for thumbnail links...")
+        thumbnail_links = soup.find_all('a', {'id': 'thumbnail', 'class': 'yt-simple-endpoint inline-block style-scope ytd-thumbnail'})
+        if thumbnail_links:
+            logger.debug("Found %s thumbnail links", len(thumbnail_links))
+            for link in thumbnail_links:
+                href = link.get('href', '')
+                if '/watch?v=' in href:
+                    video_id = href.split('watch?v=')[1].split('&')[0]
+                    video_url = f"https://www.youtube.com/watch?v={video_id}"
+                    if video_url not in video_links:
+                        video_links[video_url] = None
+                        logger.debug("Found video link: %s", video_url)
     
-    # Save the HTML for debugging
-    with open("playlist_page.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print("\nSaved HTML page to playlist_page.html for debugging")
+        # Second try: Look for video renderers
+        logger.debug("Looking for video renderers...")
+        renderers = soup.find_all(['ytd-playlist-video-renderer', 'ytd-playlist-panel-video-renderer'])
+        if renderers:
+            logger.debug("Found %s video renderers", len(renderers))
+            for renderer in renderers:
+                # Try to get video ID from the renderer's attributes
+                video_id = renderer.get('data-video-id')
+                if video_id:
+                    video_url = f"https://www.youtube.com/watch?v={video_id}"
+                    if video_url not in video_links:
+                        video_links[video_url] = None
+                        logger.debug("Found video from renderer data: %s", video_url)
+                    continue
+            
+                # Look for thumbnail links within the renderer
+                thumbnail = renderer.find('a', {'id': 'thumbnail'})
+                if thumbnail and 'href' in thumbnail.attrs:
+                    href = thumbnail['href']
+                    if '/watch?v=' in href:
+                        video_id = href.split('watch?v=')[1].split('&')[0]
+                        video_url = f"https://www.youtube.com/watch?v={video_id}"
+                        if video_url not in video_links:
+                            video_links[video_url] = None
+                            logger.debug("Found video from renderer thumbnail: %s", video_url)
     
-    # First try: Direct link extraction from thumbnails
-    print("\nLooking for thumbnail links...")
-    thumbnail_links = soup.find_all('a', {'id': 'thumbnail', 'class': 'yt-simple-endpoint inline-block style-scope ytd-thumbnail'})
-    if thumbnail_links:
-        print(f"Found {len(thumbnail_links)} thumbnail links")
-        for link in thumbnail_links:
+        # Third try: Look for any watch links
+        logger.debug("Looking for watch links...")
+        all_links = soup.find_all('a', href=True)
+        for link in all_links:
             href = link.get('href', '')
             if '/watch?v=' in href:
                 video_id = href.split('watch?v=')[1].split('&')[0]
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                if url not in video_links:
-                    video_links.append(url)
-                    print(f"Found video link: {url}")
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found watch link: %s", video_url)
     
-    # Second try: Look for video renderers
-    print("\nLooking for video renderers...")
-    renderers = soup.find_all(['ytd-playlist-video-renderer', 'ytd-playlist-panel-video-renderer'])
-    if renderers:
-        print(f"Found {len(renderers)} video renderers")
-        for renderer in renderers:
-            # Try to get video ID from the renderer's attributes
-            video_id = renderer.get('data-video-id')
-            if video_id:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                if url not in video_links:
-                    video_links.append(url)
-                    print(f"Found video from renderer data: {url}")
+        # Fourth try: Look for video IDs in any script tags
+        logger.debug("Looking for video IDs in scripts...")
+        scripts = soup.find_all('script')
+        for script in scripts:
+            if not script.string:
                 continue
-            
-            # Look for thumbnail links within the renderer
-            thumbnail = renderer.find('a', {'id': 'thumbnail'})
-            if thumbnail and 'href' in thumbnail.attrs:
-                href = thumbnail['href']
-                if '/watch?v=' in href:
-                    video_id = href.split('watch?v=')[1].split('&')[0]
-                    url = f"https://www.youtube.com/watch?v={video_id}"
-                    if url not in video_links:
-                        video_links.append(url)
-                        print(f"Found video from renderer thumbnail: {url}")
-    
-    # Third try: Look for any watch links
-    print("\nLooking for watch links...")
-    all_links = soup.find_all('a', href=True)
-    for link in all_links:
-        href = link.get('href', '')
-        if '/watch?v=' in href:
-            video_id = href.split('watch?v=')[1].split('&')[0]
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            if url not in video_links:
-                video_links.append(url)
-                print(f"Found watch link: {url}")
-    
-    # Fourth try: Look for video IDs in any script tags
-    print("\nLooking for video IDs in scripts...")
-    scripts = soup.find_all('script')
-    for script in scripts:
-        if not script.string:
-            continue
         
-        # Look for videoId patterns
-        matches = re.findall(r'"videoId":"([^"]+)"', script.string)
-        for video_id in matches:
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            if url not in video_links:
-                video_links.append(url)
-                print(f"Found video ID in script: {url}")
+            # Look for videoId patterns
+            matches = re.findall(r'"videoId":"([^"]+)"', script.string)
+            for video_id in matches:
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                if video_url not in video_links:
+                    video_links[video_url] = None
+                    logger.debug("Found video ID in script: %s", video_url)
     
-    # Print summary
+    # Summary; each link was already logged at debug level when found
     if video_links:
-        print(f"\nFound {len(video_links)} unique video links:")
-        for i, url in enumerate(video_links, 1):
-            print(f"{i}. {url}")
+        logger.info("Found %s unique video links", len(video_links), extra={'count': len(video_links)})
+        debug_capture.sample('playlist_page', html_content, url)
     else:
-        print("\nNo video links found!")
-        print("Debug files have been created:")
-        print("1. playlist_page.html - The raw HTML page")
-        print("Please check if the playlist is accessible and contains videos.")
+        logger.warning("No video links found! Check that the playlist is accessible and contains videos.")
+        debug_capture.capture('playlist_page', html_content, "no video links", url)
     
-    return video_links
+    return list(video_links)
 
-def get_playlist_videos(playlist_id, original_url=None):
-    """Get list of video URLs from playlist"""
-    videos = []
+def iter_playlist_videos(playlist_id, original_url=None):
+    """Yield video records from a playlist as each page is read"""
+    url = f"https://www.youtube.com/playlist?list={playlist_id}"
+    found = 0
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Cookie': 'CONSENT=YES+1'
-        }
+        # Playlist page first, following continuation pages past the first ~100 videos
+        logger.debug("Trying to fetch playlist: %s", url)
+        response = http_client.get(url)
         
-        # If we have a watch URL, try that first
-        if original_url and 'watch?v=' in original_url:
-            print(f"\nTrying to fetch from watch URL: {original_url}")
-            response = requests.get(original_url, headers=headers)
-            if response.status_code == 200:
-                videos = analyze_html_response(response.text)
+        if response.status_code == 200:
+            for video in iter_playlist_page_videos(response.content):
+                found += 1
+                logger.debug("%s. %s %s", found, video['url'], video['title'] or '', extra={'video_id': video['id']})
+                yield video
+            if not found:
+                for video in analyze_html_response(response.content, url):
+                    found += 1
+                    yield as_record(video, found)
         
-        # If no videos found yet, try the playlist page
-        if not videos:
-            url = f"https://www.youtube.com/playlist?list={playlist_id}"
-            print(f"\nTrying to fetch playlist: {url}")
-            response = requests.get(url, headers=headers)
-            
+        # If no videos found yet, try the watch URL (only shows a partial panel)
+        if not found and original_url and 'watch?v=' in original_url:
+            logger.info("Trying to fetch from watch URL: %s", original_url)
+            response = http_client.get(original_url)
             if response.status_code == 200:
-                videos = analyze_html_response(response.text)
-
-        # Show results
-        print(f"\nFound {len(videos)} videos in total")
-        if videos:
-            print("\nVideos found:")
-            for i, video in enumerate(videos, 1):
-                print(f"{i}. {video}")
-        else:
-            print("\nNo videos found. Please check if the playlist is:")
-            print("1. Public (not private or unlisted)")
-            print("2. Contains videos")
-            print("3. Accessible in your region")
-            print("\nYou can verify by opening the playlist URL in your browser:")
-            print(url)
-        
-        return videos
+                for video in analyze_html_response(response.content, original_url):
+                    found += 1
+                    yield as_record(video, found)
 
     except Exception as e:
-        print(f"Error getting playlist videos: {str(e)}")
-        return videos
+        logger.error("Error getting playlist videos: %s", e)
+
+    # Show results
+    logger.info("Found %s videos in total", found, extra={'count': found})
+    if not found:
+        logger.warning("No videos found. Check that the playlist is public, contains videos and is "
+                       "accessible in your region by opening it in your browser: %s", url)
+
+def get_playlist_videos(playlist_id, original_url=None):
+    """Get list of video records from playlist"""
+    return list(iter_playlist_videos(playlist_id, original_url))
 
 def get_safe_filename(title):
     """Convert title to safe filename"""
@@ -164,133 +181,93 @@ def get_video_title(video_id):
     """Get video title using YouTube's oEmbed API"""
     try:
         oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        response = http_client.get(oembed_url)
         if response.status_code == 200:
             return response.json()['title']
     except Exception:
         pass
     return video_id
 
-def get_transcript(video_id):
-    """Try to get transcript in English first, then fall back to original language"""
-    try:
-        # Get all available transcripts
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        print("\nAvailable transcript languages:")
-        for transcript in transcript_list:
-            print(f"- {transcript.language} ({'Auto-generated' if transcript.is_generated else 'Manual'})")
-        
-        # First priority: Manual English transcript
-        try:
-            transcript = transcript_list.find_transcript(['en'])
-            if not transcript.is_generated:
-                print("\nUsing manual English transcript")
-                return transcript.fetch()
-        except:
-            pass
-
-        # Second priority: Auto-generated English transcript
-        try:
-            transcript = transcript_list.find_generated_transcript(['en'])
-            print("\nUsing auto-generated English transcript")
-            return transcript.fetch()
-        except:
-            pass
-        
-        # Third priority: Try to translate to English if available
-        try:
-            # Get the first manual transcript
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                original_transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                try:
-                    translated = original_transcript.translate('en')
-                    print(f"\nTranslated manual transcript from {original_transcript.language} to English")
-                    return translated.fetch()
-                except:
-                    print(f"\nUsing original manual transcript in {original_transcript.language} (translation not available)")
-                    return original_transcript.fetch()
-        except:
-            pass
+def get_transcript(video_id, manifest=None):
+    """Get the transcript picked by TRACK_POLICY: English first, then a translation, then anything.
 
-        # Fourth priority: First available manual transcript
-        try:
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                print(f"\nUsing manual transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-        
-        # Last priority: First available transcript of any kind
-        try:
-            available = list(transcript_list)
-            if available:
-                transcript = available[0]
-                print(f"\nUsing available transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-            
-    except Exception as e:
-        if "No transcripts were found" in str(e):
-            print("\nNo transcripts available for this video")
-        else:
-            print(f"\nError getting transcript: {str(e)}")
-    return None
+    Returns (transcript, language_code), or (None, None) if nothing is available.
+    """
+    return fetch_transcript(video_id, TRACK_POLICY, manifest)
 
-def download_video_transcript(video_url, output_dir):
-    """Download transcript for a single video"""
+def download_video_transcript(video, output_dir, manifest=None):
+    """Download transcript for a single video record or watch URL, recording the outcome in the manifest if given"""
+    video_id = None
     try:
         # Get video ID
-        if 'watch?v=' in video_url:
-            video_id = video_url.split('watch?v=')[1].split('&')[0]
-        else:
-            print(f"Invalid video URL: {video_url}")
+        video = as_record(video)
+        video_id = video['id']
+        if not video_id:
+            logger.warning("Invalid video URL: %s", video['url'])
+            return False
+        if manifest and manifest.is_unavailable(video_id):
+            logger.debug("Skipping video without transcripts: %s", video['title'] or video_id)
             return False
 
-        # Get video title
-        video_title = get_video_title(video_id)
-        safe_title = get_safe_filename(video_title)
-        print(f"\nProcessing video: {video_title}")
+        # A transcript saved by an earlier run only needs the formats it is missing
+        saved = manifest.completed_path(video_id) if manifest else None
+        if saved:
+            base = output_writers.saved_base(saved, output_dir)
+            formats = output_writers.missing_formats(base, OUTPUT_FORMATS)
+            if not formats:
+                return True
+            logger.debug("Adding %s output for: %s", ', '.join(formats), base)
+        else:
+            # Use the title from enumeration; oEmbed only when it is missing
+            video_title = video['title'] or get_video_title(video_id)
+            base = os.path.join(output_dir, get_safe_filename(video_title))
+            formats = OUTPUT_FORMATS
+            logger.debug("Processing video: %s", video_title)
 
-        # Get transcript
-        transcript = get_transcript(video_id)
+        # Get transcript, from a saved JSONL copy when there is one
+        transcript = output_writers.load_segments(base) if saved else None
+        if transcript is not None:
+            language = manifest.get(video_id)['language']
+        else:
+            transcript, language = get_transcript(video_id, manifest)
         if not transcript:
-            print("Could not get transcript (no captions available in any language)")
+            logger.debug("Could not get transcript for %s (no captions available in any language)", video_id)
+            # keep the completed entry of a transcript saved before
+            if manifest and not saved:
+                manifest.mark_failed(video_id, "no transcript")
             return False
 
-        # Format transcript - now without timestamps
-        formatted_transcript = []
-        for entry in transcript:
-            formatted_transcript.append(entry['text'])
-
-        # Save to file
-        filename = os.path.join(output_dir, f"{safe_title}_transcript.txt")
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(formatted_transcript))
+        # Format and save, one pass over the segments for all missing OUTPUT_FORMATS
+        outputs = output_writers.write_transcript(transcript, base, OUTPUT_FORMATS, only=formats)
+        if manifest:
+            manifest.mark_written(video_id, language, outputs[0]['path'], outputs[0]['sha256'], sum(output['bytes'] for output in outputs))
         
-        print(f"Transcript saved to: {filename}")
+        logger.debug("Transcript saved to: %s", ', '.join(output['path'] for output in outputs), extra={'video_id': video_id})
         return True
 
     except Exception as e:
-        print(f"Error processing video: {str(e)}")
+        logger.error("Error processing video: %s", e, extra={'video_id': video_id})
+        if manifest and video_id:
+            manifest.mark_failed(video_id, str(e))
         return False
 
 def get_channel_and_playlist_info(playlist_id):
     """Get channel name and playlist title"""
     try:
         url = f"https://www.youtube.com/playlist?list={playlist_id}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Try the playlist header in ytInitialData first
+            data = extract_initial_data(response.content)
+            if data:
+                channel_name, playlist_name = get_playlist_header(data)
+                if channel_name and playlist_name:
+                    return channel_name, playlist_name
+            
+            from bs4 import BeautifulSoup
+            with profiling.span('bs4_parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             # Try to get channel name
             channel_name = None
@@ -314,11 +291,11 @@ def get_channel_and_playlist_info(playlist_id):
                 return channel_name, playlist_name
             
     except Exception as e:
-        print(f"Error getting channel and playlist info: {str(e)}")
+        logger.error("Error getting channel and playlist info: %s", e)
     
     return "Unknown_Channel", f"Playlist_{playlist_id}"
 
-def process_playlist():
+def process_playlist(max_workers=DEFAULT_WORKERS, manifest=None):
     try:
         # Get playlist URL
         print("\nPlease enter the YouTube playlist URL (or 'q' to quit):")
@@ -332,11 +309,26 @@ def process_playlist():
             print("No URL provided. Please try again or enter 'q' to quit.")
             return True
         
+        transcribe_playlist(playlist_url, max_workers, manifest)
+        return True
+
+    except Exception as e:
+        print(f"\nAn unexpected error occurred: {str(e)}")
+        print("Please try again with a different playlist URL.")
+        return True
+
+def transcribe_playlist(playlist_url, max_workers=DEFAULT_WORKERS, manifest=None, executor=None):
+    """Download every transcript of a playlist without prompting.
+
+    Returns (successful, failed, results) as download_videos does; results
+    is empty when the playlist could not be read.
+    """
+    try:
         # Get playlist ID
         playlist_id = get_playlist_id(playlist_url)
         if not playlist_id:
-            print("Error: Could not extract playlist ID from URL")
-            return True
+            logger.error("Error: Could not extract playlist ID from URL")
+            return 0, 0, []
         
         # Get channel and playlist names
         channel_name, playlist_name = get_channel_and_playlist_info(playlist_id)
@@ -354,38 +346,28 @@ def process_playlist():
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        print(f"\nChannel: {channel_name}")
-        print(f"Playlist: {playlist_name}")
-        print(f"Getting videos from playlist: {playlist_url}")
-        videos = get_playlist_videos(playlist_id, playlist_url)
-        
-        if not videos:
-            print("No videos found in the playlist.")
-            return True
-        
-        print(f"\nFound {len(videos)} videos. Starting transcript download...")
+        logger.info("Channel: %s, playlist: %s", channel_name, playlist_name)
+        logger.info("Getting videos from playlist: %s", playlist_url, extra={'playlist_id': playlist_id})
+        if manifest is None:
+            manifest = RunManifest()
+        # Downloads start as soon as the first page of videos is read
+        videos = with_titles(iter_playlist_videos(playlist_id, playlist_url), get_video_title, manifest)
+        logger.info("Starting transcript download...")
         
-        successful = 0
-        failed = 0
+        successful, failed, results = download_videos(videos, output_dir, download_video_transcript, max_workers, manifest, executor, OUTPUT_FORMATS)
         
-        for i, video_url in enumerate(videos, 1):
-            print(f"\nProcessing video {i}/{len(videos)}")
-            if download_video_transcript(video_url, output_dir):
-                successful += 1
-            else:
-                failed += 1
-            time.sleep(1)  # Add delay to avoid rate limiting
+        if not results:
+            logger.warning("No videos found in the playlist.")
+            return successful, failed, results
         
-        print(f"\nDownload complete!")
-        print(f"Successfully downloaded: {successful} transcripts")
-        print(f"Failed to download: {failed} transcripts")
-        print(f"Transcripts are saved in: {output_dir}")
-        return True
+        logger.info("Download complete! Successfully downloaded: %s, failed: %s. Transcripts are saved in: %s",
+                    successful, failed, output_dir,
+                    extra={'successful': successful, 'failed': failed, 'output_dir': output_dir})
+        return successful, failed, results
 
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {str(e)}")
-        print("Please try again with a different playlist URL.")
-        return True
+        logger.error("An unexpected error occurred: %s", e)
+        return 0, 0, []
 
 if __name__ == "__main__":
     print("YouTube Playlist Transcript Downloader")
@@ -0,0 +1,135 @@
+import contextlib
+import json
+import math
+import threading
+import time
+import log
+
+logger = log.get_logger(__name__)
+
+# Optional per-stage timing for the download pipeline. The main stages
+# (page fetch, HTML parse, ytInitialData decode, rate limit wait,
+# list_transcripts, fetch, formatting and writing output) are wrapped in named
+# spans. Spans cost nothing until enable() is called; the CLI turns them
+# on with --profile and writes a p50/p95/total breakdown per stage at the
+# end of the run. cProfile can be captured alongside, from every thread.
+#
+#   with profiling.span('bs4_parse'):
+#       soup = BeautifulSoup(html, 'html.parser')
+
+ENABLED = False
+
+_lock = threading.Lock()
+_durations = {}
+_null = contextlib.nullcontext()
+_profilers = []
+
+class _Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+def span(name):
+    """Time the enclosed block as one occurrence of a stage"""
+    return _Span(name) if ENABLED else _null
+
+def timed(name, func):
+    """Return func, wrapped in a span when profiling is on"""
+    if not ENABLED:
+        return func
+    def wrapper(*args, **kwargs):
+        with _Span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def record(name, seconds):
+    """Add one measured duration to a stage"""
+    with _lock:
+        _durations.setdefault(name, []).append(seconds)
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def report():
+    """Return {stage: {count, total, p50, p95, max}} in seconds, slowest total first"""
+    with _lock:
+        stages = {name: sorted(values) for name, values in _durations.items()}
+    summary = {}
+    for name, values in sorted(stages.items(), key=lambda item: -sum(item[1])):
+        summary[name] = {
+            'count': len(values),
+            'total': round(sum(values), 6),
+            'p50': round(_percentile(values, 0.50), 6),
+            'p95': round(_percentile(values, 0.95), 6),
+            'max': round(values[-1], 6),
+        }
+    return summary
+
+def format_report(summary):
+    """Render report() as a fixed-width table"""
+    lines = [f"{'stage':<24} {'count':>7} {'total s':>10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}"]
+    for name, stats in summary.items():
+        lines.append(f"{name:<24} {stats['count']:>7} {stats['total']:>10.3f} {stats['p50'] * 1000:>10.2f} "
+                     f"{stats['p95'] * 1000:>10.2f} {stats['max'] * 1000:>10.2f}")
+    return '\n'.join(lines)
+
+def write_report(path):
+    """Log the stage table and save it as JSON"""
+    summary = report()
+    logger.info("Stage profile:\n%s", format_report(summary), extra={'profile': summary})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    logger.info("Profile saved to: %s", path)
+
+#########################################
+# cProfile across worker threads
+#########################################
+
+def _start_thread_profiler(frame, event, arg):
+    # Runs on the first profile event of each new thread and replaces
+    # itself with a profiler for that thread
+    import cProfile
+    profiler = cProfile.Profile()
+    with _lock:
+        _profilers.append(profiler)
+    profiler.enable()
+
+def start_cprofile():
+    """Profile the calling thread and every thread started after this call"""
+    import cProfile
+    profiler = cProfile.Profile()
+    with _lock:
+        _profilers.append(profiler)
+    threading.setprofile(_start_thread_profiler)
+    profiler.enable()
+
+def stop_cprofile(path):
+    """Stop all profilers, merge their stats and save them for pstats"""
+    import pstats
+    threading.setprofile(None)
+    with _lock:
+        profilers = list(_profilers)
+        _profilers.clear()
+    for profiler in profilers:
+        profiler.disable()
+    if not profilers:
+        return
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    stats.dump_stats(path)
+    logger.info("cProfile stats from %d threads saved to: %s (python -m pstats %s)", len(profilers), path, path)
@@ -0,0 +1,154 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import metrics
+import profiling
+
+# Adaptive pacing for YouTube requests. Each endpoint class gets its own
+# token bucket: the rate is cut on 429/5xx (honouring Retry-After) and
+# raised again after a run of successful requests.
+
+# endpoint class -> (initial requests/sec, burst size)
+ENDPOINT_RATES = {
+    'www': (2.0, 4),
+    'oembed': (5.0, 10),
+    'transcript': (2.0, 4),
+}
+
+MIN_RATE = 0.1
+MAX_RATE = 20.0
+BACKOFF_FACTOR = 0.5
+RAMP_UP_FACTOR = 1.25
+RAMP_UP_AFTER = 20  # consecutive successes before raising the rate
+
+# Exceptions raised by youtube_transcript_api when YouTube is throttling us
+THROTTLE_ERRORS = ('TooManyRequests', 'RequestBlocked', 'IpBlocked')
+
+class TokenBucket:
+    """Thread-safe token bucket with multiplicative backoff and ramp-up"""
+
+    def __init__(self, rate, capacity, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = capacity
+        self.paused_until = 0.0
+        self.success_streak = 0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self, tokens=1):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return
+                    wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, retry_after=None):
+        """Cut the rate after a throttling response"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+            self.tokens = 0
+            self.success_streak = 0
+            now = time.monotonic()
+            self._last_refill = now
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+    def reward(self):
+        """Raise the rate again after sustained success"""
+        with self._lock:
+            self.success_streak += 1
+            if self.success_streak >= RAMP_UP_AFTER:
+                self.rate = min(self.max_rate, self.rate * RAMP_UP_FACTOR)
+                self.success_streak = 0
+
+_buckets = {}
+_lock = threading.Lock()
+
+def get_bucket(endpoint):
+    """Return the shared bucket for an endpoint class"""
+    bucket = _buckets.get(endpoint)
+    if bucket is None:
+        with _lock:
+            bucket = _buckets.get(endpoint)
+            if bucket is None:
+                rate, capacity = ENDPOINT_RATES.get(endpoint, ENDPOINT_RATES['www'])
+                bucket = TokenBucket(rate, capacity)
+                _buckets[endpoint] = bucket
+    return bucket
+
+def classify_url(url):
+    """Map a URL to its endpoint class"""
+    if '/oembed' in url:
+        return 'oembed'
+    if '/api/timedtext' in url:
+        return 'transcript'
+    return 'www'
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def acquire(endpoint):
+    """Wait for permission to send one request to an endpoint class"""
+    with profiling.span('rate_limit_wait'):
+        get_bucket(endpoint).acquire()
+
+def is_throttled(status_code):
+    """Whether a status code means we should back off and retry"""
+    return status_code == 429 or status_code >= 500
+
+def report(endpoint, status_code, retry_after=None):
+    """Feed a response status back into the endpoint's bucket"""
+    bucket = get_bucket(endpoint)
+    if is_throttled(status_code):
+        bucket.penalize(parse_retry_after(retry_after))
+    else:
+        bucket.reward()
+
+def throttled(endpoint, func, *args, **kwargs):
+    """Call func under the endpoint's rate limit.
+
+    Used for youtube_transcript_api calls, which do their own HTTP.
+    """
+    bucket = get_bucket(endpoint)
+    with profiling.span('rate_limit_wait'):
+        bucket.acquire()
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        metrics.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+        metrics.inc('http_requests_total', endpoint=endpoint, status=type(e).__name__)
+        if type(e).__name__ in THROTTLE_ERRORS or 'Too Many Requests' in str(e):
+            metrics.inc('http_throttled_total', endpoint=endpoint)
+            bucket.penalize()
+        raise
+    metrics.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+    metrics.inc('http_requests_total', endpoint=endpoint, status='ok')
+    bucket.reward()
+    return result
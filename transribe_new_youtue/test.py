@@ -1,6 +1,9 @@
 import os
 import re
 from pytube import Playlist
+import log
+
+logger = log.get_logger(__name__)
 
 def get_safe_filename(title):
     """Sanitize the playlist title to create a safe directory name."""
@@ -14,11 +17,11 @@ def extract_video_urls(playlist_url):
         playlist._video_regex = re.compile(r"\"url\":\"(/watch\?v=[\w-]*)")
         video_urls = playlist.video_urls
         if not video_urls:
-            print("No videos found in the playlist. Please check the URL or playlist privacy settings.")
+            logger.warning("No videos found in the playlist. Please check the URL or playlist privacy settings.")
             return []
         return video_urls
     except Exception as e:
-        print(f"Error processing playlist: {e}")
+        logger.error("Error processing playlist: %s", e)
         return []
 
 def main():
@@ -40,7 +43,7 @@ def main():
             playlist = Playlist(playlist_url)
             output_dir = get_safe_filename(playlist.title)
         except Exception as e:
-            print(f"Error retrieving playlist title: {e}")
+            logger.error("Error retrieving playlist title: %s", e)
             output_dir = "Playlist"
 
     # Create the directory if it doesn't exist
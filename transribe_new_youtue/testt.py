@@ -1,10 +1,18 @@
 import os
 import re
-import time
-import requests
+import http_client
 from pytube import Playlist
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+from transcript_selection import fetch_transcript as select_transcript
 from urllib.parse import urlparse, parse_qs
+import log
+import output_writers
+
+logger = log.get_logger(__name__)
+
+TRACK_POLICY = ('manual:en', 'generated:en')
+
+# Files written per video, by output_writers name
+OUTPUT_FORMATS = ('lines',)
 
 def get_safe_filename(title):
     """Sanitize the video title to create a safe filename."""
@@ -21,7 +29,7 @@ def get_video_title(video_id):
     """Fetches video title using YouTube's oEmbed API."""
     try:
         oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        response = http_client.get(oembed_url)
         if response.status_code == 200:
             return response.json()['title']
     except Exception:
@@ -29,50 +37,36 @@ def get_video_title(video_id):
     return video_id  # Fallback to video ID if title retrieval fails
 
 def fetch_transcript(video_id):
-    """Fetches transcript for a given video ID."""
-    try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        return transcript_list.find_transcript(['en']).fetch()
-    except NoTranscriptFound:
-        try:
-            return transcript_list.find_generated_transcript(['en']).fetch()
-        except NoTranscriptFound:
-            print(f"No transcript available for video ID: {video_id}")
-            return None
-    except TranscriptsDisabled:
-        print(f"Transcripts are disabled for video ID: {video_id}")
-        return None
-    except Exception as e:
-        print(f"Error fetching transcript for video ID {video_id}: {e}")
-        return None
+    """Fetches the English (manual or auto-generated) transcript for a given video ID."""
+    transcript, _ = select_transcript(video_id, TRACK_POLICY)
+    if not transcript:
+        logger.info("No transcript available for video ID: %s", video_id)
+    return transcript
 
 def save_transcript(transcript, title, output_dir):
-    """Saves the transcript to a text file."""
+    """Saves the transcript in every OUTPUT_FORMATS format."""
     safe_title = get_safe_filename(title)
-    filename = os.path.join(output_dir, f"{safe_title}_transcript.txt")
-    with open(filename, 'w', encoding='utf-8') as file:
-        for entry in transcript:
-            file.write(f"{entry['text']}\n")
-    print(f"Transcript saved: {filename}")
+    outputs = output_writers.write_transcript(transcript, os.path.join(output_dir, safe_title), OUTPUT_FORMATS)
+    logger.debug("Transcript saved: %s", ', '.join(output['path'] for output in outputs))
 
 def process_video(video_url, output_dir):
     """Processes a single video: fetches its transcript and saves it."""
     try:
         video_id = get_video_id(video_url)
         if not video_id:
-            print(f"Error extracting video ID for URL: {video_url}")
+            logger.warning("Error extracting video ID for URL: %s", video_url)
             return
         
         title = get_video_title(video_id)
-        print(f"\nProcessing video: {title}")
+        logger.debug("Processing video: %s", title)
 
         transcript = fetch_transcript(video_id)
         if transcript:
             save_transcript(transcript, title, output_dir)
         else:
-            print(f"Skipping video '{title}' due to missing transcript.")
+            logger.info("Skipping video '%s' due to missing transcript.", title)
     except Exception as e:
-        print(f"Error processing video {video_url}: {e}")
+        logger.error("Error processing video %s: %s", video_url, e)
 
 def download_playlist_transcripts(playlist_url, output_dir=None):
     """Extracts videos from a playlist and processes them for transcripts."""
@@ -81,7 +75,7 @@ def download_playlist_transcripts(playlist_url, output_dir=None):
         playlist._video_regex = re.compile(r"\"url\":\"(/watch\?v=[\w-]*)")
 
         if not playlist.video_urls:
-            print("No videos found in the playlist. Please check the URL or playlist privacy settings.")
+            logger.warning("No videos found in the playlist. Please check the URL or playlist privacy settings.")
             return
 
         if not output_dir:
@@ -90,12 +84,11 @@ def download_playlist_transcripts(playlist_url, output_dir=None):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        print(f"\nFound {len(playlist.video_urls)} videos in the playlist.")
+        logger.info("Found %s videos in the playlist.", len(playlist.video_urls))
         for video_url in playlist.video_urls:
             process_video(video_url, output_dir)
-            time.sleep(1)  # Pause to prevent rate limiting
     except Exception as e:
-        print(f"Error processing playlist: {e}")
+        logger.error("Error processing playlist: %s", e)
 
 if __name__ == "__main__":
     playlist_url = input("Enter the YouTube playlist URL: ").strip()
@@ -0,0 +1,123 @@
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, islice, repeat
+from operator import floordiv, mod
+
+# Compact in-memory form of a fetched transcript. The transcript API hands
+# back one dict per caption segment; a multi-hour lecture is tens of
+# thousands of them, each a dict plus two float objects and a str. Here
+# starts and durations live in two typed arrays (8 bytes per segment each)
+# and all caption text in one string, with segment i spanning
+# text[offsets[i]:offsets[i + 1]].
+#
+#   segments = TranscriptSegments.from_entries(track.fetch())
+#   segments.format_timestamped()         # "[MM:SS] text" lines
+#   segments.between(600, 1200).plain_text()
+#
+# Iterating still yields {'text', 'start', 'duration'} dicts, one at a
+# time, for code that expects the API's own format.
+
+# Offsets need at least 4 bytes; 'I' is 4 bytes on every usual platform
+OFFSET_TYPE = 'I' if array('I').itemsize >= 4 else 'L'
+
+# "SS]" halves of the [MM:SS] labels, indexed by second
+_SECOND_LABELS = [f"{second:02d}]" for second in range(60)]
+
+class TranscriptSegments:
+    """Caption segments stored as typed arrays plus one text buffer"""
+
+    __slots__ = ('starts', 'durations', 'offsets', 'text')
+
+    def __init__(self, starts=None, durations=None, text='', offsets=None):
+        self.starts = starts if starts is not None else array('d')
+        self.durations = durations if durations is not None else array('d')
+        self.text = text
+        self.offsets = offsets if offsets is not None else array(OFFSET_TYPE, [0])
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build from the API's segment dicts (or objects with text/start/duration attributes)"""
+        if isinstance(entries, cls):
+            return entries
+        starts = array('d')
+        durations = array('d')
+        texts = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                texts.append(entry['text'])
+                starts.append(entry['start'])
+                durations.append(entry.get('duration', 0.0))
+            else:
+                texts.append(entry.text)
+                starts.append(entry.start)
+                durations.append(entry.duration)
+        offsets = array(OFFSET_TYPE, [0])
+        offsets.extend(accumulate(map(len, texts)))
+        return cls(starts, durations, ''.join(texts), offsets)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def segment_text(self, i):
+        """Text of segment i"""
+        return self.text[self.offsets[i]:self.offsets[i + 1]]
+
+    def texts(self):
+        """Iterate over the segment texts"""
+        text = self.text
+        offsets = self.offsets
+        return map(text.__getitem__, map(slice, offsets, islice(offsets, 1, None)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            first, last, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TranscriptSegments only supports contiguous slices")
+            last = max(first, last)
+            base = self.offsets[first]
+            offsets = array(OFFSET_TYPE, [offset - base for offset in self.offsets[first:last + 1]])
+            return TranscriptSegments(self.starts[first:last], self.durations[first:last],
+                                      self.text[base:self.offsets[last]], offsets)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return {'text': self.segment_text(index), 'start': self.starts[index], 'duration': self.durations[index]}
+
+    def __iter__(self):
+        for text, start, duration in zip(self.texts(), self.starts, self.durations):
+            yield {'text': text, 'start': start, 'duration': duration}
+
+    def between(self, start, end=None):
+        """Segments starting in [start, end) seconds; starts are in playback order"""
+        first = bisect_left(self.starts, start)
+        last = len(self) if end is None else bisect_left(self.starts, end, first)
+        return self[first:last]
+
+    def timestamps(self):
+        """[MM:SS] label of every segment start, minutes not wrapped at the hour"""
+        # Whole-array passes: minutes and seconds are split with map(),
+        # each distinct minute is formatted once and seconds come from a table
+        seconds = list(map(int, self.starts))
+        minutes = list(map(floordiv, seconds, repeat(60, len(seconds))))
+        minute_labels = {minute: f"[{minute:02d}:" for minute in set(minutes)}
+        return list(map(str.__add__, map(minute_labels.__getitem__, minutes),
+                        map(_SECOND_LABELS.__getitem__, map(mod, seconds, repeat(60, len(seconds))))))
+
+    def plain_text(self, separator='\n'):
+        """All segment texts joined without timestamps"""
+        return separator.join(self.texts())
+
+    def format_timestamped(self, separator='\n'):
+        """All segments as "[MM:SS] text" lines"""
+        return separator.join(map('{} {}'.format, self.timestamps(), self.texts()))
+
+    def to_entries(self):
+        """Return the segments in the API's list-of-dicts format"""
+        return list(self)
+
+    def nbytes(self):
+        """Approximate memory held by the segment data"""
+        return (self.starts.itemsize * len(self.starts) + self.durations.itemsize * len(self.durations)
+                + self.offsets.itemsize * len(self.offsets) + sys.getsizeof(self.text))
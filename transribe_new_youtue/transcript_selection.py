@@ -0,0 +1,130 @@
+from rate_limiter import throttled
+from transcript_segments import TranscriptSegments
+import log
+import profiling
+import metrics
+
+logger = log.get_logger(__name__)
+
+# Picks which caption track to download for a video. The track list is
+# walked once into an index, then a declared priority policy is matched
+# against that index; no find_transcript exception chains. The chosen
+# track is remembered per video in the manifest so reruns ask for the
+# same track straight away.
+#
+# A policy is an ordered sequence of rules:
+#   manual:LANG     manually created track in LANG ('*' for any language)
+#   generated:LANG  auto-generated track in LANG ('*' for any language)
+#   translate:LANG  first manual track that YouTube can translate to LANG
+#   any             first track of any kind
+
+DEFAULT_POLICY = ('manual:en', 'generated:en', 'translate:en', 'manual:*', 'any')
+
+def parse_policy(text):
+    """Turn 'manual:en,generated:en,any' into a policy tuple"""
+    rules = tuple(rule.strip() for rule in text.split(',') if rule.strip())
+    for rule in rules:
+        kind, _, language = rule.partition(':')
+        if kind not in ('manual', 'generated', 'translate', 'any') or (kind != 'any' and not language):
+            raise ValueError(f"Unknown transcript policy rule: {rule}")
+    return rules
+
+def index_tracks(transcript_list):
+    """Walk the track list once and index it by kind and language"""
+    index = {'manual': {}, 'generated': {}, 'all': []}
+    for track in transcript_list:
+        kind = 'generated' if track.is_generated else 'manual'
+        index[kind].setdefault(track.language_code, track)
+        index['all'].append(track)
+    return index
+
+def _can_translate(track, language):
+    return any(option['language_code'] == language for option in track.translation_languages)
+
+def _describe(track, kind):
+    if kind == 'translated':
+        return f"translated transcript in {track.language}"
+    if kind == 'generated':
+        return f"auto-generated transcript in {track.language}"
+    return f"manual transcript in {track.language}"
+
+def candidate_tracks(index, policy, choice=None):
+    """Yield (track, choice) pairs in preference order.
+
+    choice is a decision recorded on an earlier run and, when its track
+    still exists, comes first. Each choice is a dict with kind
+    ('manual', 'generated' or 'translated'), language and translate_to.
+    """
+    if choice:
+        source = index['manual' if choice['kind'] == 'translated' else choice['kind']].get(choice['language'])
+        if source is not None:
+            if choice['kind'] != 'translated':
+                yield source, choice
+            elif _can_translate(source, choice['translate_to']):
+                yield source.translate(choice['translate_to']), choice
+
+    for rule in policy:
+        kind, _, language = rule.partition(':')
+        if kind in ('manual', 'generated'):
+            tracks = index[kind]
+            track = next(iter(tracks.values()), None) if language == '*' else tracks.get(language)
+            if track is not None:
+                yield track, {'kind': kind, 'language': track.language_code, 'translate_to': None}
+        elif kind == 'translate':
+            for track in index['manual'].values():
+                if track.language_code != language and _can_translate(track, language):
+                    yield track.translate(language), {'kind': 'translated', 'language': track.language_code, 'translate_to': language}
+                    break
+        elif kind == 'any' and index['all']:
+            track = index['all'][0]
+            yield track, {'kind': 'generated' if track.is_generated else 'manual', 'language': track.language_code, 'translate_to': None}
+
+def fetch_transcript(video_id, policy=DEFAULT_POLICY, manifest=None):
+    """Fetch the preferred transcript of a video.
+
+    Returns (TranscriptSegments, language_code), or (None, None) if
+    nothing is available. With a manifest, videos recently found to have no
+    captions are answered without a request, the track picked last time
+    is tried first and the new pick is recorded.
+    """
+    if manifest and manifest.is_unavailable(video_id):
+        logger.debug("No transcripts available for %s (cached)", video_id)
+        return None, None
+
+    from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+    try:
+        transcript_list = throttled('transcript', profiling.timed('list_transcripts', YouTubeTranscriptApi.list_transcripts), video_id)
+    except (TranscriptsDisabled, NoTranscriptFound) as e:
+        metrics.inc('failures_total', reason=type(e).__name__)
+        logger.info("No transcripts available for %s", video_id, extra={'video_id': video_id, 'reason': type(e).__name__})
+        if manifest:
+            manifest.mark_unavailable(video_id, type(e).__name__)
+        return None, None
+    except Exception as e:
+        metrics.inc('failures_total', reason=type(e).__name__)
+        if "No transcripts were found" in str(e) or "Subtitles are disabled" in str(e):
+            logger.info("No transcripts available for %s", video_id, extra={'video_id': video_id})
+        else:
+            logger.error("Error getting transcript for %s: %s", video_id, e, extra={'video_id': video_id})
+        return None, None
+
+    choice = manifest.get_track_choice(video_id) if manifest else None
+    tried = set()
+    for track, decision in candidate_tracks(index_tracks(transcript_list), policy, choice):
+        key = (decision['kind'], decision['language'], decision['translate_to'])
+        if key in tried:
+            continue
+        tried.add(key)
+        try:
+            transcript = throttled('transcript', profiling.timed('transcript_fetch', track.fetch))
+        except Exception as e:
+            logger.warning("Could not fetch %s for %s: %s", _describe(track, decision['kind']), video_id, e, extra={'video_id': video_id})
+            continue
+        logger.debug("Using %s for %s", _describe(track, decision['kind']), video_id)
+        if manifest and decision != choice:
+            manifest.record_track_choice(video_id, decision['kind'], decision['language'], decision['translate_to'])
+        return TranscriptSegments.from_entries(transcript), track.language_code
+
+    logger.info("No transcripts available for %s", video_id, extra={'video_id': video_id})
+    metrics.inc('failures_total', reason='no_usable_track')
+    return None, None
@@ -1,7 +1,18 @@
-from youtube_transcript_api import YouTubeTranscriptApi
+from transcript_selection import fetch_transcript
 import re
 from urllib.parse import urlparse, parse_qs
-import requests
+import http_client
+import log
+import metrics
+import output_writers
+
+logger = log.get_logger(__name__)
+
+# Hindi tracks come right after English since most of these videos are in Hindi
+TRACK_POLICY = ('manual:en', 'generated:en', 'manual:hi', 'generated:hi', 'manual:*', 'any')
+
+# Files written, by output_writers name
+OUTPUT_FORMATS = ('text',)
 
 def get_video_id(url):
     """Extract video ID from YouTube URL"""
@@ -26,7 +37,7 @@ def get_video_title(video_id):
     """Get video title using YouTube's oEmbed API"""
     try:
         oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        response = http_client.get(oembed_url)
         if response.status_code == 200:
             return response.json()['title']
     except Exception:
@@ -34,102 +45,43 @@ def get_video_title(video_id):
     return video_id
 
 def get_transcript(video_id):
-    """Try to get transcript in any available language"""
-    try:
-        # First try to get all available transcripts
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        print("\nAvailable transcript languages:")
-        for transcript in transcript_list:
-            print(f"- {transcript.language} ({'Auto-generated' if transcript.is_generated else 'Manual'})")
-        
-        # Try to get English transcript first
-        try:
-            return transcript_list.find_transcript(['en']).fetch()
-        except:
-            try:
-                # Try to get auto-generated English
-                return transcript_list.find_generated_transcript(['en']).fetch()
-            except:
-                pass
-        
-        # Try to get Hindi transcript (since the video is in Hindi)
-        try:
-            return transcript_list.find_transcript(['hi']).fetch()
-        except:
-            try:
-                # Try to get auto-generated Hindi
-                return transcript_list.find_generated_transcript(['hi']).fetch()
-            except:
-                pass
-        
-        # Try to get any manual transcript
-        try:
-            manual_transcripts = [t for t in transcript_list.manual_transcripts]
-            if manual_transcripts:
-                transcript = transcript_list.find_transcript([manual_transcripts[0].language_code])
-                print(f"\nUsing manual transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-        
-        # If nothing else works, get the first available transcript
-        try:
-            available = list(transcript_list)
-            if available:
-                transcript = available[0]
-                print(f"\nUsing available transcript in {transcript.language}")
-                return transcript.fetch()
-        except:
-            pass
-            
-    except Exception as e:
-        if "No transcripts were found" in str(e):
-            print("\nNo transcripts available for this video")
-        else:
-            print(f"\nError getting transcript: {str(e)}")
-    return None
+    """Get the transcript picked by TRACK_POLICY, in any available language"""
+    transcript, _ = fetch_transcript(video_id, TRACK_POLICY)
+    return transcript
 
 def process_url(url):
     """Process a single YouTube URL"""
     try:
-        print(f"\nProcessing video: {url}")
+        logger.info("Processing video: %s", url)
         
         # Get video ID
         video_id = get_video_id(url)
         if not video_id:
-            print("Error: Could not extract video ID from URL")
+            logger.error("Error: Could not extract video ID from URL")
             return False
 
         # Get video title using oEmbed API
         video_title = get_video_title(video_id)
         safe_title = get_safe_filename(video_title)
-        print(f"Video title: {video_title}")
+        logger.info("Video title: %s", video_title)
 
         # Get transcript
         transcript = get_transcript(video_id)
         if not transcript:
-            print("\nError: Could not get transcript.")
-            print("This might be because:")
-            print("- The video has no captions in any language")
-            print("- The video is private or unavailable")
-            print("- YouTube API request failed")
+            logger.error("Error: Could not get transcript. The video may have no captions in any language, "
+                         "be private or unavailable, or the YouTube API request failed.", extra={'video_id': video_id})
             return False
 
-        # Format transcript without timestamps
-        formatted_transcript = [entry['text'] for entry in transcript]
-
-        # Save to file
-        filename = f"{safe_title}_transcript.txt"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(formatted_transcript))
+        # Format and save in every OUTPUT_FORMATS format
+        outputs = output_writers.write_transcript(transcript, safe_title, OUTPUT_FORMATS)
+        metrics.inc('transcripts_written_total')
+        metrics.inc('transcript_bytes_written_total', sum(output['bytes'] for output in outputs))
         
-        print(f"\nTranscript successfully saved to: {filename}")
+        logger.info("Transcript successfully saved to: %s", ', '.join(output['path'] for output in outputs))
         return True
 
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {str(e)}")
-        print("Please try again with a different video.")
+        logger.error("An unexpected error occurred: %s. Please try again with a different video.", e)
         return False
 
 def download_transcript():
@@ -0,0 +1,114 @@
+import json
+import profiling
+
+# Fast path for pulling the ytInitialData JSON out of a YouTube page.
+# The marker is located in the raw response and the object is decoded in
+# place with raw_decode, so no DOM is built and the page is never sliced
+# into intermediate strings. BeautifulSoup stays as the fallback for pages
+# without the blob.
+
+MARKERS = (b'var ytInitialData = ', b'window["ytInitialData"] = ', b'ytInitialData = ')
+
+_decoder = json.JSONDecoder()
+
+def extract_initial_data(content):
+    """Return the ytInitialData object from page bytes or text, or None"""
+    with profiling.span('initial_data_decode'):
+        return _find_initial_data(content)
+
+def _find_initial_data(content):
+    for marker in MARKERS:
+        if isinstance(content, str):
+            start = content.find(marker.decode())
+            if start == -1:
+                continue
+            text, pos = content, start + len(marker)
+        else:
+            start = content.find(marker)
+            if start == -1:
+                continue
+            # Decode only the tail of the page, straight from the buffer
+            text, pos = str(memoryview(content)[start + len(marker):], 'utf-8', 'replace'), 0
+        try:
+            data, _ = _decoder.raw_decode(text, pos)
+            return data
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def get_text(obj):
+    """Flatten a YouTube text object ({'runs': [...]} or {'simpleText': ...})"""
+    if not isinstance(obj, dict):
+        return ''
+    if 'runs' in obj:
+        return ' '.join(t.get('text', '') for t in obj['runs'])
+    if 'simpleText' in obj:
+        return obj['simpleText']
+    return obj.get('content', '')
+
+def get_playlist_contents(data):
+    """Return the raw playlistVideoListRenderer contents of a playlist page.
+
+    The last item is a continuationItemRenderer when the playlist has more pages.
+    """
+    try:
+        return data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', [])[0].get('tabRenderer', {}).get('content', {}).get('sectionListRenderer', {}).get('contents', [])[0].get('itemSectionRenderer', {}).get('contents', [])[0].get('playlistVideoListRenderer', {}).get('contents', [])
+    except (IndexError, AttributeError):
+        return []
+
+def get_channel_grid_contents(data, tab_title='Videos'):
+    """Return the raw richGridRenderer contents of a channel tab (the Videos tab by default).
+
+    Falls back to the selected tab with a grid when no tab has the title.
+    The last item is a continuationItemRenderer when the tab has more pages.
+    """
+    grids = []
+    try:
+        for tab in data.get('contents', {}).get('twoColumnBrowseResultsRenderer', {}).get('tabs', []):
+            renderer = tab.get('tabRenderer', {})
+            grid = renderer.get('content', {}).get('richGridRenderer')
+            if grid is None:
+                continue
+            if renderer.get('title') == tab_title:
+                return grid.get('contents', [])
+            if renderer.get('selected'):
+                grids.insert(0, grid)
+            else:
+                grids.append(grid)
+    except AttributeError:
+        return []
+    return grids[0].get('contents', []) if grids else []
+
+def get_playlist_video_renderers(data):
+    """Return the video renderers of a playlist page or a watch page playlist panel"""
+    renderers = []
+    # For playlist page
+    for item in get_playlist_contents(data):
+        if 'playlistVideoRenderer' in item:
+            renderers.append(item['playlistVideoRenderer'])
+
+    try:
+        # For watch page with playlist
+        playlist_panel = data.get('contents', {}).get('twoColumnWatchNextResults', {}).get('playlist', {}).get('playlist', {}).get('contents', [])
+        for item in playlist_panel:
+            if 'playlistPanelVideoRenderer' in item:
+                renderers.append(item['playlistPanelVideoRenderer'])
+    except AttributeError:
+        pass
+
+    return renderers
+
+def get_channel_external_id(data):
+    """Return the channel id (UC...) from a channel page's metadata, or None"""
+    metadata = data.get('metadata', {}).get('channelMetadataRenderer', {})
+    return metadata.get('externalId') or None
+
+def get_playlist_header(data):
+    """Return (channel_name, playlist_title) from a playlist page, None where missing"""
+    header = data.get('header', {}).get('playlistHeaderRenderer', {})
+    playlist_title = get_text(header.get('title', {})) or None
+    channel_name = None
+    owner = header.get('ownerText', {})
+    if owner.get('runs'):
+        channel_name = owner['runs'][0].get('text', '') or None
+    return channel_name, playlist_title